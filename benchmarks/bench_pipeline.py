@@ -0,0 +1,111 @@
+""" Benchmarks each stage of the zeta pipeline on a synthetic Zipf-distributed corpus,
+reporting wall time and peak memory (as traced by tracemalloc) per stage. Each stage
+is timed on an untraced run and, unless --no-memory is given, run once more under
+tracemalloc to measure its peak, since tracing slows the allocations down.
+
+Run from the repository root, e.g.:
+
+    python benchmarks/bench_pipeline.py --docs 200 --doc-len 2000 8000 --vocab 20000
+    python benchmarks/bench_pipeline.py --spacy --json results.json
+"""
+# Import the required modules
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zeta_project.synthetic import zipf_corpus, write_corpus  # noqa: E402
+from zeta_project.zeta import (stream_texts, lowercase_corpus, tokenize_corpus, lemmata_pos_ner_tag,  # noqa: E402
+                               build_segments_corpus, build_segments_index, feature_occurs_corpus,
+                               count_segments_with_feature, count_segments_with_feature_index,
+                               zeta_all_features)
+
+
+# Run a single stage, measuring its wall time and its peak memory allocation
+def measure(results: list, trace_memory: bool, stage: str, function, *args, items: int | None = None, **kwargs):
+    """ Calls the function with the specified arguments, appends the stage name, the
+    wall time in seconds, the tracemalloc peak in MiB and the number of processed
+    items to the results list and returns the function result. The time is taken on
+    an untraced call; if 'trace_memory' is set, the function is called a second time
+    under tracemalloc for the peak, otherwise the peak is left empty."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        del result
+        tracemalloc.start()
+        result = function(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    results.append({'Stage': stage, 'Seconds': elapsed, 'Peak MiB': peak, 'Items': items})
+    return result
+
+
+def run(args: argparse.Namespace) -> pd.DataFrame:
+    """ Generates the corpus and runs all the pipeline stages, returning the measures."""
+    results = []
+    step = partial(measure, results, args.memory)
+    doc_len = tuple(args.doc_len) if len(args.doc_len) == 2 else args.doc_len[0]
+    corpus = step('generate corpus', zipf_corpus, args.docs, doc_len, args.vocab, args.exponent,
+                  seed=args.seed, items=args.docs)
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(directory, corpus)
+        texts = step('read texts', lambda: dict(stream_texts(directory)), items=args.docs)
+    del corpus
+    lowercase = step('lowercase_corpus', lowercase_corpus, list(texts.values()), items=args.docs)
+    tokens = step('tokenize_corpus', tokenize_corpus, lowercase, items=args.docs)
+    step('tokenize_corpus (single pass, lowercasing)', tokenize_corpus, list(texts.values()), fast=True,
+         items=args.docs)
+    if args.spacy:
+        step('lemmata_pos_ner_tag', lemmata_pos_ner_tag, list(texts.values()),
+             n_process=args.n_process, items=args.docs)
+    n_tokens = sum(len(text_tokens) for text_tokens in tokens)
+    segments = step('build_segments_corpus', build_segments_corpus, tokens, args.segment_len, items=n_tokens)
+    half = len(segments) // 2
+    features = [token for token, _ in pd.Series(tokens[0]).value_counts().head(args.features).items()]
+    step(f'feature_occurs_corpus x {len(features)}',
+         lambda: [count_segments_with_feature(feature_occurs_corpus(segments, feature)) for feature in features],
+         items=len(features))
+    index, offsets = step('build_segments_index', build_segments_index, segments, items=n_tokens)
+    step(f'count_segments_with_feature_index x {len(features)}',
+         lambda: [count_segments_with_feature_index(index, offsets, feature) for feature in features],
+         items=len(features))
+    step('zeta_all_features', zeta_all_features, segments[:half], segments[half:], items=len(index))
+    return pd.DataFrame(results)
+
+
+def main(argv: list | None = None) -> pd.DataFrame:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=100, help="number of texts")
+    parser.add_argument('--doc-len', type=int, nargs='+', default=[5000],
+                        help="words per text, or a minimum and a maximum")
+    parser.add_argument('--vocab', type=int, default=20000, help="vocabulary size")
+    parser.add_argument('--exponent', type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument('--segment-len', type=int, default=2000, help="segment length in tokens")
+    parser.add_argument('--features', type=int, default=50, help="features queried one at a time")
+    parser.add_argument('--spacy', action='store_true', help="also benchmark the SpaCy annotation")
+    parser.add_argument('--n-process', type=int, default=1, help="SpaCy worker processes")
+    parser.add_argument('--seed', type=int, default=0, help="random seed of the corpus generator")
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="only measure the wall time, without the traced second run of each stage")
+    parser.add_argument('--json', help="file to write the measures to as JSON")
+    args = parser.parse_args(argv)
+    report = run(args)
+    print(report.to_string(index=False, float_format=lambda value: f'{value:.4f}'))
+    if args.json:
+        with open(args.json, 'wt', encoding='utf-8') as file:
+            json.dump({'parameters': vars(args), 'stages': report.to_dict(orient='records')}, file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
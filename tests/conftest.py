@@ -0,0 +1,15 @@
+import pytest
+
+
+# Create a small corpus directory with its metadata table, shared by the tests of the corpus level APIs
+@pytest.fixture
+def corpus_files(tmp_path):
+    texts = {"a1": "The sea. The ship, the sea!", "a2": "A ship and the sea", "b1": "The house and the garden",
+             "c1": "A garden by the sea"}
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for idno, text in texts.items():
+        (corpus / f"{idno}.txt").write_text(text)
+    metadata = tmp_path / "metadata.tsv"
+    metadata.write_text("idno\tauthor\na1\tA\na2\tA\nb1\tB\nc1\tC\n")
+    return corpus, metadata
@@ -0,0 +1,27 @@
+from zeta_project.cache import cache_key, cache_path, store_annotation, load_annotation
+
+
+# Test case for cache_key() function
+def test_cache_key():
+    key = cache_key("Some text", "en_core_web_sm", "3.7.1")
+
+    # The key is deterministic and changes with the text, the model name and the model version
+    assert key == cache_key("Some text", "en_core_web_sm", "3.7.1")
+    assert key != cache_key("Some other text", "en_core_web_sm", "3.7.1")
+    assert key != cache_key("Some text", "en_core_web_md", "3.7.1")
+    assert key != cache_key("Some text", "en_core_web_sm", "3.7.2")
+
+
+# Test case for store_annotation() and load_annotation() functions
+def test_store_and_load_annotation(tmp_path):
+    key = cache_key("Mr. Hungerton was", "en_core_web_sm", "3.7.1")
+    layers = {'tokens': ["Mr.", "Hungerton", "was"], 'lemma': ["Mr.", "Hungerton", "be"],
+              'pos': ["PROPN", "PROPN", "AUX"], 'ner': []}
+
+    # Nothing is returned before the annotation is stored
+    assert load_annotation(tmp_path, key) is None
+
+    # The stored layers are read back unchanged
+    store_annotation(tmp_path, key, layers)
+    assert cache_path(tmp_path, key).endswith(key + '.npz')
+    assert load_annotation(tmp_path, key) == layers
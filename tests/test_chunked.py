@@ -0,0 +1,67 @@
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from zeta_project.chunked import PartialCounts, chunk_files, aggregate_chunk, merge_partials, chunked_zeta
+from zeta_project.zeta import metadata_lookup, stream_texts, stream_segment_summaries, zeta_from_summaries
+
+
+# Test case for the PartialCounts class
+def test_partial_counts(tmp_path):
+    first = PartialCounts({'A': 2}, {'A': {'sea': 2, 'ship': 1}})
+    second = PartialCounts()
+    second.add('A', 1, Counter({'sea': 1}))
+    second.add('B', 3, Counter({'house': 2}))
+    third = PartialCounts({'B': 1}, {'B': {'sea': 1}})
+
+    # Merging is associative and commutative and does not change the merged counts
+    assert (first + second) + third == first + (second + third) == third + second + first
+    assert first == PartialCounts({'A': 2}, {'A': {'sea': 2, 'ship': 1}})
+    merged = first + second + third
+    assert merged.partition_totals('A') == (Counter({'sea': 3, 'ship': 1}), Counter({'house': 2, 'sea': 1}), 3, 4)
+
+    # Spilled counts are loaded back unchanged
+    merged.save(tmp_path / "counts.npz")
+    assert PartialCounts.load(tmp_path / "counts.npz") == merged
+    summary = merged.zeta('A').set_index('Feature')
+    assert summary.loc['sea', 'Zeta Value'] == pytest.approx(3 / 3 - 1 / 4)
+
+    # Missing labels are rejected rather than spilled as 'nan'
+    with pytest.raises(ValueError):
+        second.add(float('nan'), 1, Counter({'sea': 1}))
+    with pytest.raises(ValueError):
+        PartialCounts({1900: 1}, {1900: {'sea': 1}}).save(tmp_path / "numeric.npz")
+
+
+# Test case for chunk_files(), aggregate_chunk() and merge_partials() functions
+def test_aggregate_chunks(tmp_path, corpus_files):
+    corpus, metadata = corpus_files
+    labels = metadata_lookup(str(metadata), 'author')
+    chunks = chunk_files(str(corpus), 3)
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    with pytest.raises(ValueError):
+        chunk_files(str(corpus), 0)
+
+    # Texts without a label are skipped and spilled chunks merge like in-memory ones
+    del labels["c1"]
+    labels["b1"] = float('nan')
+    in_memory = [aggregate_chunk(chunk, 2, labels) for chunk in chunks]
+    spilled = [aggregate_chunk(chunk, 2, labels, str(tmp_path / f"{i}.npz")) for i, chunk in enumerate(chunks)]
+    assert spilled == [str(tmp_path / "0.npz"), str(tmp_path / "1.npz")]
+    assert merge_partials(spilled) == merge_partials(in_memory)
+    assert set(merge_partials(in_memory).totals) == {'A'}
+
+
+# Test case for chunked_zeta() function
+def test_chunked_zeta(tmp_path, corpus_files):
+    corpus, metadata = corpus_files
+    labels = metadata_lookup(str(metadata), 'author')
+    expected = zeta_from_summaries(stream_segment_summaries(stream_texts(str(corpus)), 2), {"a1", "a2"})
+    expected = expected.set_index('Feature').sort_index()
+
+    # The same summary whatever the chunks, the processes and the spilling
+    for chunk_size, n_process, spill_dir in ((1, 1, None), (3, 2, str(tmp_path / "spill")), (10, 1, None)):
+        summary = chunked_zeta(str(corpus), labels, "A", 2, chunk_size, n_process, spill_dir)
+        pd.testing.assert_frame_equal(summary.set_index('Feature').sort_index(), expected)
+    assert sorted(p.name for p in (tmp_path / "spill").iterdir()) == ["chunk-000000.npz", "chunk-000001.npz"]
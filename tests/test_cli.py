@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from zeta_project.cli import main, read_features
+from zeta_project.corpus import LazyCorpus
+from zeta_project.profiling import PROFILER, disable_profiling
+
+
+# Test case for read_features() function
+def test_read_features(tmp_path):
+    feature_file = tmp_path / "features.txt"
+    feature_file.write_text("sea\n\nship\n")
+    assert read_features(['all']) is None
+    assert read_features(['the', f'@{feature_file}']) == ['the', 'sea', 'ship']
+
+
+# Test case for main() with a list of features
+def test_main_features(tmp_path, corpus_files):
+    corpus, metadata = corpus_files
+    output = tmp_path / "summary.csv"
+
+    # The summary is written sorted by descending zeta values
+    assert main([str(corpus), str(metadata), '--column', 'author', '--value', 'A', '--segment-length', '2',
+                 '--features', 'house', 'sea', 'the', '--output', str(output)]) == 0
+    summary = pd.read_csv(output)
+    assert summary['Feature'].tolist() == ['sea', 'the', 'house']
+    assert summary['Target Partition Ratio'].tolist() == pytest.approx([3 / 6, 4 / 6, 0.0])
+    assert summary['Reference Partition Ratio'].tolist() == pytest.approx([1 / 6, 3 / 6, 1 / 6])
+
+
+# Test case for main() evaluating all the features
+def test_main_all_features(corpus_files, capsys):
+    corpus, metadata = corpus_files
+
+    # Without an output file, the summary is printed to stdout
+    main([str(corpus), str(metadata), '--column', 'author', '--value', 'B', '--segment-length', '3'])
+    summary = pd.read_csv(pd.io.common.StringIO(capsys.readouterr().out))
+    assert set(summary['Feature']) == {'the', 'sea', 'ship', 'a', 'and', 'house', 'garden', 'by'}
+    assert summary['Feature'].iloc[0] in {'house', 'garden'}
+
+
+# Test case for main() evaluating n-gram features
+def test_main_ngram(tmp_path, corpus_files):
+    corpus, metadata = corpus_files
+    output = tmp_path / "summary.csv"
+    main([str(corpus), str(metadata), '--column', 'author', '--value', 'A', '--segment-length', '3',
+          '--ngram', '2', '--output', str(output)])
+    summary = pd.read_csv(output).set_index('Feature')
+    assert summary.loc['the sea', 'Target Segments with Feature'] == 3
+    assert summary.loc['the house', 'Reference Segments with Feature'] == 1
+    assert 'ship and' in summary.index and 'and the' not in summary.index
+
+    # Requested n-grams occurring in neither partition are reported with zero ratios, as unigrams are
+    main([str(corpus), str(metadata), '--column', 'author', '--value', 'A', '--segment-length', '3',
+          '--ngram', '2', '--features', 'the sea', 'no such', '--output', str(output)])
+    summary = pd.read_csv(output).set_index('Feature')
+    assert summary.index.tolist() == ['the sea', 'no such']
+    assert summary.loc['no such', ['Target Partition Ratio', 'Reference Partition Ratio']].tolist() == [0, 0]
+
+
+# Test case for main() reporting invalid arguments without a traceback
+def test_main_errors(tmp_path, corpus_files, capsys, monkeypatch):
+    corpus, metadata = corpus_files
+    arguments = [str(corpus), str(metadata), '--column', 'author', '--value', 'A']
+    for extra, message in ((['--segment-length', '0'], "must be greater than zero"),
+                           (['--n-process', '0'], "must be greater than zero or -1"),
+                           (['--column', 'year'], "cannot read the 'idno' and 'year' columns"),
+                           (['--value', 'D'], "no text has the value 'D'"),
+                           (['--features', f'@{tmp_path / "missing.txt"}'], "cannot read the features file")):
+        with pytest.raises(SystemExit) as error:
+            main(arguments + extra)
+        assert error.value.code == 2
+        assert message in capsys.readouterr().err
+    with pytest.raises(SystemExit) as error:
+        main([str(tmp_path / "missing")] + arguments[1:])
+    assert error.value.code == 2
+    assert "cannot read the corpus" in capsys.readouterr().err
+
+    # Invalid partitions are reported before the texts are tokenized
+    monkeypatch.setattr(LazyCorpus, 'compute', lambda self, layer: pytest.fail(f"{layer} computed"))
+    with pytest.raises(SystemExit):
+        main(arguments[:-1] + ['D'])
+
+
+# Test case for main() writing the profiling report
+def test_main_profile(tmp_path, corpus_files):
+    corpus, metadata = corpus_files
+    report = tmp_path / "profile.csv"
+    try:
+        main([str(corpus), str(metadata), '--column', 'author', '--value', 'A', '--segment-length', '2',
+              '--output', str(tmp_path / "summary.csv"), '--profile', str(report)])
+    finally:
+        disable_profiling()
+        PROFILER.reset()
+    assert {'tokenize_corpus', 'build_segments_corpus', 'compute_zeta'} <= set(pd.read_csv(report)['Stage'])
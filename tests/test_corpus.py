@@ -0,0 +1,49 @@
+import pytest
+
+import zeta_project.corpus
+from zeta_project.corpus import LazyCorpus, DISABLED_COMPONENTS
+
+
+# Replace lemmata_pos_ner_tag() with a function recording the disabled components
+@pytest.fixture
+def tag_calls(monkeypatch):
+    calls = []
+
+    def fake_tag(texts, disable=(), **kwargs):
+        calls.append(disable)
+        return ([text.split() for text in texts], [["X"] * len(text.split()) for text in texts],
+                [[] if 'ner' in disable else ["PERSON"] for text in texts])
+
+    monkeypatch.setattr(zeta_project.corpus, "lemmata_pos_ner_tag", fake_tag)
+    return calls
+
+
+# Test case for LazyCorpus with the token layer only
+def test_lazy_corpus_tokens(tmp_path, tag_calls):
+    (tmp_path / "a.txt").write_text("The SEA, the ship!")
+    (tmp_path / "b.txt").write_text("A house")
+    corpus = LazyCorpus.from_directory(tmp_path)
+
+    # Tokens are computed on first access, without SpaCy
+    assert len(corpus) == 2 and 'Tokenized Text' not in corpus
+    assert corpus['Tokenized Text'] == [["the", "sea", "the", "ship"], ["a", "house"]]
+    assert 'Tokenized Text' in corpus
+    assert tag_calls == []
+    assert corpus.to_dataframe(['Tokenized Text'])['idno'].tolist() == ["a.txt", "b.txt"]
+    with pytest.raises(KeyError):
+        corpus['Unknown']
+
+
+# Test case for LazyCorpus with the SpaCy layers
+def test_lazy_corpus_annotations(tag_calls):
+    corpus = LazyCorpus({"a.txt": "Mr. Hungerton was", "b.txt": "upon earth"})
+
+    # Lemmata and POS tags come from a single run without parser and entity recognizer
+    assert corpus['POS'] == [["X", "X", "X"], ["X", "X"]]
+    assert corpus['Lemmata'] == [["Mr.", "Hungerton", "was"], ["upon", "earth"]]
+    assert tag_calls == [DISABLED_COMPONENTS['POS']]
+    assert 'NER' not in corpus
+
+    # NER tags are computed on their own run
+    assert corpus['NER'] == [["PERSON"], ["PERSON"]]
+    assert tag_calls == [DISABLED_COMPONENTS['POS'], DISABLED_COMPONENTS['NER']]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from zeta_project.encoding import (Vocabulary, encode_corpus, zeta_encoded, save_prepared_corpus,
+                                   load_prepared_corpus)
+from zeta_project.zeta import build_segments_corpus, segment_feature_matrix, zeta_all_features
+
+
+# Test case for the Vocabulary class
+def test_vocabulary():
+    vocabulary = Vocabulary(["the", "cat"])
+
+    # Known tokens keep their IDs, unknown ones are appended
+    encoded = vocabulary.encode(["the", "dog", "the", "cat"])
+    assert encoded.dtype == np.int32
+    assert encoded.tolist() == [0, 2, 0, 1]
+    assert len(vocabulary) == 3
+    assert "dog" in vocabulary and "bird" not in vocabulary
+    assert vocabulary["dog"] == 2 and vocabulary.get("bird") is None
+    assert vocabulary.features == ["the", "cat", "dog"]
+    assert vocabulary.decode(encoded) == ["the", "dog", "the", "cat"]
+
+
+# Test case for encode_corpus() function and the EncodedCorpus class
+def test_encode_corpus():
+    tokens_lists = [["the", "first", "text", "ends"], [], ["the", "second", "one"]]
+    corpus = encode_corpus(tokens_lists)
+
+    # The texts share a single buffer and are returned as views on it
+    assert len(corpus) == 3
+    assert corpus.offsets.tolist() == [0, 4, 4, 7]
+    assert corpus.lengths().tolist() == [4, 0, 3]
+    assert corpus.vocabulary.decode(corpus.document(2)) == ["the", "second", "one"]
+    segments = corpus.segments(0, 3)
+    assert [corpus.vocabulary.decode(segment) for segment in segments] == [["the", "first", "text"], ["ends"]]
+    assert all(np.shares_memory(segment, corpus.tokens) for segment in segments)
+    assert corpus.segments_count(3).tolist() == [2, 0, 1]
+    with pytest.raises(ValueError):
+        corpus.segments_count(0)
+
+
+# Test case for EncodedCorpus.segment_matrix() method
+def test_segment_matrix():
+    tokens_lists = [["a", "b", "a", "a", "c"], ["c", "c"], ["b", "d", "d"]]
+    corpus = encode_corpus(tokens_lists)
+
+    # The matrix matches the one built from the materialized segments
+    for documents in (None, [2, 0]):
+        selected = tokens_lists if documents is None else [tokens_lists[i] for i in documents]
+        expected = segment_feature_matrix(build_segments_corpus(selected, 2), corpus.vocabulary)
+        assert (corpus.segment_matrix(2, documents) != expected).nnz == 0
+
+
+# Test case for zeta_encoded() function
+def test_zeta_encoded():
+    tokens_lists = [["a", "b", "a", "c"], ["a", "b"], ["b", "c", "c"]]
+    corpus = encode_corpus(tokens_lists)
+    segments = build_segments_corpus(tokens_lists, 2)
+
+    # The result matches zeta_all_features() on the materialized segments
+    result = zeta_encoded(corpus, [0, 1], [2], 2).set_index('Feature').sort_index()
+    expected = zeta_all_features(segments[:2], segments[2:]).set_index('Feature').sort_index()
+    assert result.to_dict() == expected.to_dict()
+
+
+# Test case for EncodedCorpus.segment_offsets() method
+def test_segment_offsets():
+    corpus = encode_corpus([["a", "b", "c"], [], ["d", "e", "f", "g"]])
+
+    # Segments never span two texts and the last offset is the buffer length
+    assert corpus.segment_offsets(2).tolist() == [0, 2, 3, 5, 7]
+
+
+# Test case for save_prepared_corpus() and load_prepared_corpus() functions
+def test_prepared_corpus(tmp_path):
+    tokens_lists = [["the", "first", "text", "ends"], ["the", "second", "one"]]
+    corpus = encode_corpus(tokens_lists)
+    metadata = pd.DataFrame({'idno': ["t1", "t2"], 'author': ["A", "B"]})
+    save_prepared_corpus(tmp_path, corpus, 3, metadata)
+
+    # The arrays are memory-mapped and the segments match build_segments_corpus()
+    prepared = load_prepared_corpus(tmp_path)
+    assert isinstance(prepared.corpus.tokens, np.memmap)
+    assert prepared.segment_len == 3
+    assert prepared.document_segments.tolist() == [0, 2, 3]
+    segments = [prepared.corpus.vocabulary.decode(prepared.segment(j)) for j in range(3)]
+    assert segments == [["the", "first", "text"], ["ends"], ["the", "second", "one"]]
+    pd.testing.assert_frame_equal(prepared.metadata, metadata)
+    assert prepared.corpus.segment_matrix(3).shape == (3, 6)
+
+    # The metadata must have one row for each text
+    with pytest.raises(ValueError):
+        save_prepared_corpus(tmp_path, corpus, 3, metadata.head(1))
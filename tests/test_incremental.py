@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+import pytest
+
+from zeta_project.incremental import IncrementalZeta
+from zeta_project.zeta import stream_texts, stream_segment_summaries, zeta_from_summaries
+
+
+# Compute the expected scores from scratch
+def full_scores(specified_path, target_idnos, segment_len):
+    summaries = stream_segment_summaries(stream_texts(specified_path), segment_len)
+    return zeta_from_summaries(summaries, target_idnos).set_index('Feature').sort_index()
+
+
+# Test case for IncrementalZeta.add_document() and IncrementalZeta.remove_document() methods
+def test_add_remove_document():
+    model = IncrementalZeta(2)
+    model.add_document("t1", "a b a c", True)
+    model.add_document("r1", "b c c", False)
+    model.add_document("r2", "d", False)
+    assert model.segments_total == {True: 2, False: 3}
+    assert model.feature_counts[True] == {"a": 2, "b": 1, "c": 1}
+
+    # Replacing and removing texts only adjusts the counts of those texts
+    model.add_document("t1", "a", True)
+    model.remove_document("r2")
+    assert len(model) == 2 and "r2" not in model
+    assert model.segments_total == {True: 1, False: 2}
+    assert model.feature_counts == {True: {"a": 1}, False: {"b": 1, "c": 2}}
+    with pytest.raises(ValueError):
+        IncrementalZeta(0)
+
+
+# Test case for IncrementalZeta.sync() and IncrementalZeta.scores() methods
+def test_sync(tmp_path):
+    (tmp_path / "t1.txt").write_text("The sea and the ship")
+    (tmp_path / "r1.txt").write_text("The house and the garden")
+    target = {"t1", "t2"}
+    model = IncrementalZeta(2)
+    added, updated, removed = model.sync(tmp_path, target)
+    assert sorted(added) == ["r1", "t1"] and updated == [] and removed == []
+
+    # Unchanged files are not read again
+    assert model.sync(tmp_path, target) == ([], [], [])
+
+    # New, edited and deleted files are detected and the scores match a full recomputation
+    (tmp_path / "t2.txt").write_text("A ship at sea")
+    (tmp_path / "r1.txt").write_text("The house, the garden and the sea")
+    (tmp_path / "r2.txt").write_text("Another house")
+    added, updated, removed = model.sync(tmp_path, target)
+    assert sorted(added) == ["r2", "t2"] and updated == ["r1"] and removed == []
+    pd.testing.assert_frame_equal(model.scores().set_index('Feature').sort_index(), full_scores(tmp_path, target, 2))
+
+    os.remove(tmp_path / "r2.txt")
+    assert model.sync(tmp_path, target) == ([], [], ["r2"])
+    pd.testing.assert_frame_equal(model.scores().set_index('Feature').sort_index(), full_scores(tmp_path, target, 2))
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from zeta_project.measures import partition_tables, deviation_of_proportions, zeta_variants
+from zeta_project.zeta import segment_feature_matrix, zeta_all_features
+
+
+# Test case for segment_feature_matrix() counting the occurrences
+def test_segment_feature_matrix_frequencies():
+    segments_column = [[["a", "b", "a"], ["b"]], [["c", "x"]]]
+    matrix = segment_feature_matrix(segments_column, {"a": 0, "b": 1, "c": 2}, binary=False)
+    assert matrix.toarray().tolist() == [[2, 1, 0], [0, 1, 0], [0, 0, 1]]
+
+
+# Test case for partition_tables() function
+def test_partition_tables():
+    segments_column = [[["a", "b", "a", "a"], ["b", "c"]]]
+    tables = partition_tables(segments_column, {"a": 0, "b": 1, "c": 2, "d": 3})
+    assert tables['lengths'].tolist() == [4, 2]
+    assert tables['segment_counts'].tolist() == [1, 2, 1, 0]
+    assert tables['totals'].tolist() == [3, 2, 1, 0]
+    assert tables['relative'] == pytest.approx([3 / 8, (1 / 4 + 1 / 2) / 2, 1 / 4, 0])
+    with pytest.raises(ZeroDivisionError):
+        partition_tables([], {"a": 0})
+
+
+# Test case for deviation_of_proportions() function
+def test_deviation_of_proportions():
+    segments_column = [[["a", "b"], ["a", "b"]], [["a", "c", "c", "c"]]]
+    tables = partition_tables(segments_column, {"a": 0, "b": 1, "c": 2, "d": 3})
+
+    # Compare with the definition, summing over all the segments
+    lengths = np.array([2, 2, 4])
+    frequencies = np.array([[1, 1, 0], [1, 1, 0], [1, 0, 3]])
+    expected = [0.5 * np.abs(frequencies[:, f] / frequencies[:, f].sum() - lengths / lengths.sum()).sum()
+                for f in range(3)]
+    assert deviation_of_proportions(tables).tolist() == pytest.approx(expected + [1.0])
+
+
+# Test case for zeta_variants() function
+def test_zeta_variants():
+    target = [[["a", "b"], ["a", "c"]], [["a"], ["b"]]]
+    reference = [[["b", "c"], ["c", "c"]]]
+    result = zeta_variants(target, reference).set_index('Feature')
+
+    # The sd0 variant is the original zeta value
+    expected = zeta_all_features(target, reference).set_index('Feature')
+    assert result['sd0'].to_dict() == pytest.approx(expected['Zeta Value'].to_dict())
+
+    # Log-transformed and ratio variants agree in sign with the untransformed ones
+    assert (np.sign(result['sd2']) == np.sign(result['sd0'])).all()
+    assert (np.sign(result['sr2']) == np.sign(result['sr0'])).all()
+    assert ((result['dd0'] > 1) == (result['sd0'] > 0)).all()
+    assert result.loc["a", 'sd2'] == pytest.approx(np.log2(3.5 / 5) - np.log2(0.5 / 3))
+    assert result.loc["c", 'Target Relative Frequency'] == pytest.approx(1 / 8)
+    assert result.loc["c", 'Reference Relative Frequency'] == pytest.approx(3 / 4)
+    assert result.loc["a", 'Eta'] > 0
+
+    # All the relative frequency variants are built from the mean per-segment relative frequencies
+    result = zeta_variants([[["a"], ["b"] + ["x"] * 9]], [[["a", "b"]]]).set_index('Feature')
+    assert result.loc["a", 'sr0'] == pytest.approx(0.0)
+    assert result.loc["a", 'sr2'] == pytest.approx(0.0)
+    assert result.loc["a", 'dr0'] == pytest.approx(1.0)
+    assert result.loc["b", 'sr0'] < 0 and result.loc["b", 'sr2'] < 0 and result.loc["b", 'dr0'] < 1
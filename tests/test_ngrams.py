@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from zeta_project.encoding import encode_corpus
+from zeta_project.ngrams import rolling_hashes, segment_ngrams, ngram_zeta_encoded, ngram_zeta
+from zeta_project.zeta import build_segments_corpus, zeta_all_features
+
+
+# Test case for rolling_hashes() function
+def test_rolling_hashes():
+    hashes = rolling_hashes(np.array([0, 1, 0, 1, 2], dtype=np.int32), 2)
+
+    # Equal windows share a hash, different ones (also with the ID 0) do not
+    assert hashes.dtype == np.uint64 and len(hashes) == 4
+    assert hashes[0] == hashes[2]
+    assert len(set(hashes.tolist())) == 3
+    assert rolling_hashes(np.array([0]), 1)[0] != rolling_hashes(np.array([0, 0]), 2)[0]
+    assert len(rolling_hashes(np.array([0]), 3)) == 0
+    with pytest.raises(ValueError):
+        rolling_hashes(np.array([0]), 0)
+
+
+# Test case for segment_ngrams() function
+def test_segment_ngrams():
+    corpus = encode_corpus([["a", "b", "c", "d", "e"], ["f", "g"]])
+    segments, hashes, starts, lengths = segment_ngrams(corpus, 3, [2])
+
+    # 'c d' crosses a segment boundary and 'e f' a text boundary
+    bigrams = [' '.join(corpus.vocabulary.decode(corpus.tokens[start:start + 2])) for start in starts]
+    assert bigrams == ["a b", "b c", "d e", "f g"]
+    assert segments.tolist() == [0, 0, 1, 2]
+    assert lengths.tolist() == [2, 2, 2, 2]
+
+
+# Test case for ngram_zeta_encoded() and ngram_zeta() functions
+def test_ngram_zeta():
+    target = [["of", "course", "the", "sea", "of", "course"], ["the", "sea", "of", "course"]]
+    reference = [["the", "house", "of", "the", "sea"], ["a", "house"]]
+
+    # Unigrams give the same summary as the single token features
+    expected = zeta_all_features(build_segments_corpus(target, 2), build_segments_corpus(reference, 2))
+    unigrams = ngram_zeta(target, reference, 2, [1])
+    pd.testing.assert_frame_equal(unigrams.set_index('Feature').sort_index(),
+                                  expected.set_index('Feature').sort_index(), check_dtype=False)
+
+    # Bigrams count each segment fully containing them once
+    bigrams = ngram_zeta(target, reference, 3, [2]).set_index('Feature')
+    assert bigrams.loc['of course', 'Target Segments with Feature'] == 2
+    assert bigrams.loc['of course', 'Reference Segments with Feature'] == 0
+    assert bigrams.loc['the sea', 'Reference Segments with Feature'] == 1
+    assert 'house of' in bigrams.index and 'of the' not in bigrams.index
+    assert bigrams.loc['of course', 'Zeta Value'] == pytest.approx(2 / 4)
+
+    # Several lengths at once, over a subset of the texts of the encoded corpus
+    corpus = encode_corpus(target + reference)
+    mixed = ngram_zeta_encoded(corpus, np.array([1]), np.array([2]), 5, (1, 2, 3))
+    assert {'sea', 'the sea', 'the sea of'} <= set(mixed['Feature'])
+    assert 'a house' not in set(mixed['Feature'])
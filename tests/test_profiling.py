@@ -0,0 +1,77 @@
+import json
+
+import pandas as pd
+import pytest
+from scipy import sparse
+
+from zeta_project.profiling import Profiler, PROFILER, profile_stage, instrument, enable_profiling, \
+    disable_profiling, count_items
+from zeta_project.zeta import lowercase_corpus, tokenize_corpus, stream_segment_summaries
+
+
+# Enable the shared profiler for a single test and restore it afterwards
+@pytest.fixture
+def profiler():
+    PROFILER.reset()
+    enable_profiling(trace_memory=True)
+    yield PROFILER
+    disable_profiling()
+    PROFILER.reset()
+
+
+# Test case for profile_stage() with a separate profiler
+def test_profile_stage():
+    profiler = Profiler()
+
+    # Nothing is recorded while the profiler is disabled
+    with profile_stage("stage", profiler=profiler):
+        pass
+    assert profiler.stages == {}
+
+    # Nested stages record their own peaks, the outer one including the inner one
+    profiler.enable(trace_memory=True)
+    with profile_stage("outer", items=3, profiler=profiler):
+        with profile_stage("inner", profiler=profiler):
+            data = bytearray(1_000_000)
+        del data
+    profiler.disable()
+    assert profiler.stages["outer"]['Calls'] == 1 and profiler.stages["outer"]['Items'] == 3
+    assert profiler.stages["inner"]['Peak Bytes'] >= 1_000_000
+    assert profiler.stages["outer"]['Peak Bytes'] >= profiler.stages["inner"]['Peak Bytes']
+
+
+# Test case for instrument() applied to the functions of the zeta module
+def test_instrument(profiler):
+    texts = ["First TEXT.", "Second text!", "Third text"]
+    tokenize_corpus(lowercase_corpus(texts))
+    list(stream_segment_summaries(zip(["a", "b", "c"], texts), 2))
+
+    # Calls and items are counted per function, including the nested calls
+    report = profiler.report().set_index('Stage')
+    assert report.loc['lowercase_corpus', 'Calls'] == 1
+    assert report.loc['lowercase_corpus', 'Items'] == 3
+    assert report.loc['tokenize', 'Calls'] == 6
+    assert report.loc['stream_segment_summaries', 'Items'] == 3
+    assert (report['Total Seconds'] >= 0).all()
+
+    # Decorated functions keep their name and docstring
+    assert tokenize_corpus.__name__ == 'tokenize_corpus' and tokenize_corpus.__doc__
+    assert instrument(len).__name__ == 'len'
+
+
+# Test case for Profiler.write_report() method
+def test_write_report(profiler, tmp_path):
+    lowercase_corpus(["Some TEXT"])
+    profiler.write_report(tmp_path / "report.json")
+    profiler.write_report(tmp_path / "report.csv")
+    with open(tmp_path / "report.json", encoding='utf-8') as file:
+        assert json.load(file)[0]['Stage'] in {'lowercase_corpus', 'lowercase'}
+    assert set(pd.read_csv(tmp_path / "report.csv")['Stage']) == {'lowercase_corpus', 'lowercase'}
+
+
+# Test case for count_items() function
+def test_count_items():
+    assert count_items(["a", "b"]) == 2
+    assert count_items("a text") == 1
+    assert count_items(None) == 1
+    assert count_items(sparse.csr_matrix((3, 2))) == 1
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from zeta_project.resampling import (resampling_tables, observed_zeta, bootstrap_chunk, permutation_chunk,
+                                     run_chunks, zeta_significance)
+from zeta_project.zeta import zeta_all_features
+
+
+# Define partitions where 'sea' is typical of the target and 'the' is shared
+TARGET = [[["the", "sea"], ["the", "sea"], ["sea", "ship"]], [["the", "sea"], ["a", "ship"]],
+          [["sea", "the"], ["the", "wave"]]]
+REFERENCE = [[["the", "house"], ["the", "garden"]], [["a", "house"], ["the", "sea"]],
+             [["the", "garden"], ["house", "door"]]]
+
+
+# Test case for resampling_tables() and observed_zeta() functions
+def test_resampling_tables():
+    expected = zeta_all_features(TARGET, REFERENCE).set_index('Feature')['Zeta Value']
+    for unit, n_units in (('document', 6), ('segment', 13)):
+        features, matrix, sizes, is_target = resampling_tables(TARGET, REFERENCE, unit)
+        assert matrix.shape == (n_units, len(features))
+        assert sizes.sum() == 13 and is_target.sum() == n_units // 2 + (unit == 'segment')
+        observed = dict(zip(features, observed_zeta(matrix, sizes, is_target)))
+        assert observed == pytest.approx(expected.to_dict())
+    with pytest.raises(ValueError):
+        resampling_tables(TARGET, REFERENCE, 'sentence')
+
+
+# Test case for bootstrap_chunk(), permutation_chunk() and run_chunks() functions
+def test_resampling_chunks():
+    features, matrix, sizes, is_target = resampling_tables(TARGET, REFERENCE)
+
+    # Each bootstrap resample is a valid zeta value, computed on the resampled units
+    zetas = bootstrap_chunk(matrix, sizes, is_target, 20, np.random.SeedSequence(1))
+    assert zetas.shape == (20, len(features)) and np.all(np.abs(zetas) <= 1)
+
+    # Relabellings reach the small zeta of 'the' far more often than the large one of 'sea'
+    counts = dict(zip(features, permutation_chunk(matrix, sizes, is_target, 20, np.random.SeedSequence(1))))
+    assert counts['sea'] < counts['the']
+
+    # Chunks and their random streams do not depend on the number of processes
+    function = lambda size, seed: np.random.default_rng(seed).random(size)  # noqa: E731
+    serial = run_chunks(function, 25, 3, 10, 1)
+    assert [len(chunk) for chunk in serial] == [10, 10, 5]
+    assert not np.allclose(serial[0], serial[1])
+
+
+# Test case for zeta_significance() function
+def test_zeta_significance():
+    result = zeta_significance(TARGET, REFERENCE, n_bootstrap=200, n_permutations=200, seed=7)
+
+    # Reproducible for a given seed, also when distributed over worker processes
+    parallel = zeta_significance(TARGET, REFERENCE, n_bootstrap=200, n_permutations=200, seed=7, n_process=2)
+    pd.testing.assert_frame_equal(result, parallel)
+
+    # The interval contains the observed value and 'sea' is far more significant than 'the'
+    by_feature = result.set_index('Feature')
+    assert (by_feature['CI Low'] <= by_feature['Zeta Value'] + 1e-6).all()
+    assert (by_feature['CI High'] >= by_feature['Zeta Value'] - 1e-6).all()
+    assert by_feature.loc['sea', 'P Value'] < by_feature.loc['the', 'P Value']
+    assert ((result['P Value'] > 0) & (result['P Value'] <= 1)).all()
+    assert result['Zeta Value'].is_monotonic_decreasing
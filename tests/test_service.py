@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+from zeta_project.service import ZetaIndex, ZetaService, main
+from zeta_project.zeta import compute_zeta, build_segments_corpus, tokenize_corpus, lowercase_corpus
+
+
+# Index the shared corpus (see conftest.py) with segments of 2 tokens
+@pytest.fixture
+def index(corpus_files):
+    corpus, metadata = corpus_files
+    return ZetaIndex.from_corpus(str(corpus), str(metadata), 2)
+
+
+# Send an HTTP request to the service and return the status code and the JSON response
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n'
+                 .encode() + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    while (await reader.readline()).strip():
+        pass
+    response = json.loads(await reader.read())
+    writer.close()
+    return status, response
+
+
+# Test case for ZetaIndex.query() and ZetaIndex.query_batch() methods
+def test_zeta_index_query(index):
+    # The results match compute_zeta() on the corresponding partitions
+    segments = build_segments_corpus(tokenize_corpus(lowercase_corpus(
+        ["The sea. The ship, the sea!", "A ship and the sea", "The house and the garden", "A garden by the sea"])), 2)
+    expected = compute_zeta(segments[:2], segments[2:]).set_index('Feature').sort_index()
+    assert index.query('author', 'A').set_index('Feature').sort_index().equals(expected)
+    by_c = compute_zeta(segments[3:], segments[:3], ["sea", "unknown"]).set_index('Feature').sort_index()
+    first, second = index.query_batch('author', 'C', [["sea", "unknown"], None])
+    assert first.set_index('Feature').sort_index().equals(by_c)
+    assert len(second) == len(index.features)
+    with pytest.raises(KeyError):
+        index.query('genre', 'novel')
+
+
+# Test case for the ZetaService HTTP interface, batching concurrent queries
+def test_zeta_service(index):
+    batches = []
+    query_batch = index.query_batch
+
+    def recording_batch(column, value, feature_lists):
+        batches.append((column, value, len(feature_lists)))
+        return query_batch(column, value, feature_lists)
+
+    index.query_batch = recording_batch
+
+    async def scenario():
+        server = await ZetaService(index, batch_window=0.05).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            responses = await asyncio.gather(
+                request(port, 'POST', '/zeta', {'column': 'author', 'value': 'A', 'features': ['sea']}),
+                request(port, 'POST', '/zeta', {'column': 'author', 'value': 'A', 'top': 2}),
+                request(port, 'POST', '/zeta', {'column': 'author', 'value': 'B', 'features': ['house']}))
+            errors = await asyncio.gather(request(port, 'POST', '/zeta', {'column': 'genre', 'value': 'x'}),
+                                          request(port, 'POST', '/zeta', {'value': 'A'}),
+                                          request(port, 'POST', '/zeta', {'column': 'author', 'value': 'A',
+                                                                          'top': 'ten'}),
+                                          request(port, 'POST', '/zeta', {'column': 'author', 'value': 'A',
+                                                                          'features': 'sea'}),
+                                          request(port, 'GET', '/missing'))
+            health = await request(port, 'GET', '/health')
+        return responses, errors, health
+
+    responses, errors, health = asyncio.run(scenario())
+
+    # Both queries on author A were answered by a single batch
+    assert sorted(batches) == [('author', 'A', 2), ('author', 'B', 1), ('genre', 'x', 1)]
+    assert responses[0] == (200, {'results': index.query('author', 'A', ['sea']).to_dict(orient='records')})
+    assert len(responses[1][1]['results']) == 2
+    assert responses[2][1]['results'][0]['Feature'] == 'house'
+    assert [status for status, _ in errors] == [400, 400, 400, 400, 404]
+    assert 'list' in errors[3][1]['error']
+    assert health == (200, {'status': 'ok', 'texts': 4, 'features': len(index.features)})
+
+
+# Test case for main() rejecting a segment length below one
+def test_main_segment_length(corpus_files, capsys):
+    corpus, metadata = corpus_files
+    with pytest.raises(SystemExit) as error:
+        main([str(corpus), str(metadata), '--segment-length', '0'])
+    assert error.value.code == 2
+    assert "must be greater than zero" in capsys.readouterr().err
@@ -0,0 +1,30 @@
+import pytest
+
+from zeta_project.encoding import encode_corpus, zeta_encoded
+from zeta_project.sweep import positional_index, zeta_segment_length_sweep
+
+
+# Test case for positional_index() function
+def test_positional_index():
+    corpus = encode_corpus([["a", "b", "a"], ["b", "a"]])
+    feature_ids, documents, positions = positional_index(corpus)
+
+    # Occurrences are grouped by feature, then sorted by text and position
+    assert feature_ids.tolist() == [0, 0, 0, 1, 1]
+    assert documents.tolist() == [0, 0, 1, 0, 1]
+    assert positions.tolist() == [0, 2, 1, 1, 0]
+
+
+# Test case for zeta_segment_length_sweep() function
+def test_zeta_segment_length_sweep():
+    tokens_lists = [["a", "b", "a", "c", "a", "a"], ["b", "a", "c"], ["c", "c", "b", "a"], ["d"]]
+    corpus = encode_corpus(tokens_lists)
+
+    # Each column matches a full zeta computation with that segment length
+    table = zeta_segment_length_sweep(corpus, [0, 1], [2], [1, 2, 4])
+    assert table.columns.tolist() == [1, 2, 4]
+    for segment_len in [1, 2, 4]:
+        expected = zeta_encoded(corpus, [0, 1], [2], segment_len).set_index('Feature')['Zeta Value']
+        assert table[segment_len].to_dict() == pytest.approx(expected.to_dict())
+    with pytest.raises(ZeroDivisionError):
+        zeta_segment_length_sweep(corpus, [0], [], [1])
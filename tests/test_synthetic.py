@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+
+from zeta_project.synthetic import synthetic_vocabulary, zipf_corpus, write_corpus
+from zeta_project.zeta import tokenize_corpus, lowercase_corpus, define_dictionary
+
+
+# Test case for synthetic_vocabulary() function
+def test_synthetic_vocabulary():
+    words = synthetic_vocabulary(1000)
+    assert len(words) == len(set(words)) == 1000
+    assert all(word.isalpha() and word.islower() for word in words)
+    assert [len(word) for word in words] == sorted(len(word) for word in words)
+
+
+# Test case for zipf_corpus() function
+def test_zipf_corpus():
+    corpus = zipf_corpus(n_docs=5, doc_len=(200, 400), vocab_size=500, seed=1)
+
+    # The corpus is reproducible and each text length lies within the specified range
+    assert corpus == zipf_corpus(n_docs=5, doc_len=(200, 400), vocab_size=500, seed=1)
+    assert corpus != zipf_corpus(n_docs=5, doc_len=(200, 400), vocab_size=500, seed=2)
+    tokens = tokenize_corpus(lowercase_corpus(corpus.values()))
+    assert len(corpus) == 5
+    assert all(200 <= len(text_tokens) <= 400 for text_tokens in tokens)
+
+    # The frequencies decrease with the rank, the most frequent word being far above the median
+    counts = pd.Series([token for text_tokens in tokens for token in text_tokens]).value_counts()
+    assert counts.iloc[0] > 10 * counts.median()
+
+
+# Test case for write_corpus() function
+def test_write_corpus(tmp_path):
+    corpus = zipf_corpus(n_docs=4, doc_len=50, vocab_size=100)
+    meta_path = write_corpus(tmp_path / "corpus", corpus, n_groups=2)
+
+    # The texts can be read back and every text has its metadata row
+    assert define_dictionary(tmp_path / "corpus") == corpus
+    meta = pd.read_csv(meta_path, sep='\t')
+    assert meta['idno'].tolist() == [os.path.splitext(file)[0] for file in corpus]
+    assert set(meta['group']) <= {'g0', 'g1'}
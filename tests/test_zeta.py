@@ -1,7 +1,13 @@
 import os
+import tarfile
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 import pytest
+import spacy
 
 from zeta_project.zeta import (set_cwd, read_text, define_dictionary,
                                create_df, lowercase, lowercase_corpus,
@@ -9,7 +15,16 @@ from zeta_project.zeta import (set_cwd, read_text, define_dictionary,
                                build_segments, build_segments_corpus, feature_occurs,
                                feature_occurs_corpus, count_segments_with_feature, sort_descending,
                                remove_stopwords, remove_stopwords_corpus, replace_pattern_in_column,
-                               segments_count, define_partitions, total_count, ratio, zeta, fill_dataframe)
+                               segments_count, define_partitions, total_count, ratio, zeta, fill_dataframe,
+                               build_vocabulary, segment_feature_matrix, feature_segment_counts,
+                               zeta_all_features, build_segments_index, feature_occurs_index,
+                               count_segments_with_feature_index, load_model, stream_texts,
+                               summarize_segments, stream_segment_summaries, zeta_from_summaries,
+                               tokenize_fast, map_texts, compute_zeta, ZetaResults, top_k_indices, top_k,
+                               document_feature_matrix, zeta_one_vs_rest, load_corpus, read_archive,
+                               top_k_zeta, document_ids, metadata_lookup, partition_labels,
+                               partition_positions, SegmentStatistics, worker_count, zeta_from_counters)
+from zeta_project.encoding import Vocabulary
 
 
 # Test set_cwd() using the tmp_path fixture, which provides a temporary
@@ -216,6 +231,27 @@ def test_define_partitions(test_dataframe):
     assert reference.equals(pd.DataFrame({'Text': ['Text 2', 'Text 4'], 'Value': ['b', 'c']}, index=[1, 3]))
 
 
+# Test case for document_ids(), metadata_lookup(), partition_labels() and partition_positions() functions
+def test_partition_labels(tmp_path):
+    assert document_ids(['text1.txt', 'text2.pdf', 'text.3.txt', 'text4']) == ['text1', 'text2', 'text.3', 'text4']
+    metadata = tmp_path / "metadata.tsv"
+    metadata.write_text("idno\tauthor\tyear\nt1\ta\t1900\nt2\tb\t1910\nt3\ta\t1920\nt1\tb\t1930\n")
+
+    # Only the needed column is read and a repeated idno keeps its first row
+    lookup = metadata_lookup(str(metadata), 'author')
+    assert lookup == {'t1': 'a', 't2': 'b', 't3': 'a'}
+
+    # Texts missing from the metadata fall into the reference partition, as after define_partitions()
+    labels = partition_labels(['t3', 't4', 't1', 't2'], lookup, 'a')
+    assert labels.dtype == np.int8 and labels.tolist() == [1, 0, 1, 0]
+    target, reference = partition_positions(labels)
+    assert target.tolist() == [0, 2] and reference.tolist() == [1, 3]
+    df = pd.DataFrame({'idno': ['t3', 't4', 't1', 't2']}).merge(pd.read_csv(metadata, sep='\t', dtype=str)
+                                                                .drop_duplicates('idno'), how='left', on='idno')
+    zp, vp = define_partitions(df, 'author', 'a')
+    assert zp.index.tolist() == target.tolist() and vp.index.tolist() == reference.tolist()
+
+
 # Test case for build_segments() function
 def test_build_segments():
     # Create a list of string tokens
@@ -387,3 +423,429 @@ def test_fill_dataframe():
 
     # Assert if returned and expected content match
     assert df_updated.equals(pd.DataFrame({'A': [1], 'B': ['string'], 'C': [3]}))
+
+
+# Test case for build_vocabulary() function
+def test_build_vocabulary():
+    # Define two segments columns sharing some features
+    target = [[["a", "b"], ["b", "c"]]]
+    reference = [[["c", "d"]], [["a"]]]
+
+    # Features are indexed in order of first occurrence across both columns
+    assert build_vocabulary(target, reference) == {"a": 0, "b": 1, "c": 2, "d": 3}
+
+
+# Test case for segment_feature_matrix() and feature_segment_counts() functions
+def test_segment_feature_matrix():
+    # Define a segments column and a vocabulary which misses one of its features
+    segments_column = [[["a", "b", "a"], ["b"]], [["c", "x"]]]
+    vocabulary = {"a": 0, "b": 1, "c": 2}
+
+    # One row per segment, one column per feature, repeated features are counted once
+    matrix = segment_feature_matrix(segments_column, vocabulary)
+    assert matrix.shape == (3, 3)
+    assert matrix.toarray().tolist() == [[1, 1, 0], [0, 1, 0], [0, 0, 1]]
+    assert feature_segment_counts(matrix).tolist() == [1, 2, 1]
+
+
+# Test case for zeta_all_features() function
+def test_zeta_all_features():
+    # Define a target and a reference segments column
+    target = [[["a", "b"], ["a", "c"]], [["a"], ["b"]]]
+    reference = [[["b", "c"], ["c"]]]
+
+    # Call the function under test and index the result by feature
+    result = zeta_all_features(target, reference)
+    by_feature = result.set_index('Feature')
+
+    # The result matches the one computed feature by feature with ratio() and zeta()
+    for feature in ["a", "b", "c"]:
+        zp_count = sum(count_segments_with_feature(feature_occurs_corpus(target, feature)))
+        vp_count = sum(count_segments_with_feature(feature_occurs_corpus(reference, feature)))
+        assert by_feature.loc[feature, 'Target Segments with Feature'] == zp_count
+        assert by_feature.loc[feature, 'Reference Segments with Feature'] == vp_count
+        assert by_feature.loc[feature, 'Zeta Value'] == pytest.approx(zeta(ratio(zp_count, 4), ratio(vp_count, 2)))
+    assert result['Feature'].iloc[0] == "a"
+    assert result['Zeta Value'].is_monotonic_decreasing
+    with pytest.raises(ZeroDivisionError):
+        zeta_all_features(target, [])
+
+
+# Test case for build_segments_index() function
+def test_build_segments_index():
+    segments_column = [[["a", "b", "a"], ["b"]], [], [["a", "c"]]]
+
+    # Each feature maps to the IDs of the segments containing it, repeated features are indexed once
+    index, offsets = build_segments_index(segments_column)
+    assert index == {"a": [0, 2], "b": [0, 1], "c": [2]}
+    assert offsets == [0, 2, 2, 3]
+
+
+# Test case for feature_occurs_index() and count_segments_with_feature_index() functions
+def test_feature_occurs_index():
+    segments_column = [[["Find", "a", "hashtag"], ["here", "."]], [["Another", "test"], ["with", "hashtag"]]]
+    index, offsets = build_segments_index(segments_column)
+
+    # Segment IDs replace the segment copies returned by feature_occurs_corpus()
+    assert feature_occurs_index(index, offsets, "hashtag") == [[0], [3]]
+    assert feature_occurs_index(index, offsets, "missing") == [[], []]
+    assert (count_segments_with_feature(feature_occurs_index(index, offsets, "hashtag"))
+            == count_segments_with_feature(feature_occurs_corpus(segments_column, "hashtag")))
+    assert count_segments_with_feature_index(index, offsets, "hashtag") == [1, 1]
+    assert count_segments_with_feature_index(index, offsets, "missing") == [0, 0]
+
+
+# Test case for load_model() function
+def test_load_model(monkeypatch):
+    # Replace spacy.load() with a blank English pipeline and record each call
+    calls = []
+
+    def fake_load(model_name):
+        calls.append(model_name)
+        return spacy.blank("en")
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    load_model.cache_clear()
+
+    # The model is loaded only once and the same object is returned afterwards
+    nlp = load_model("test_model")
+    assert load_model("test_model") is nlp
+    assert calls == ["test_model"]
+
+    # Tagging reuses the cached model, with the specified components disabled
+    lemma, pos, ner = lemmata_pos_ner_tag(pd.Series(["A first text", "second"]), model_name="test_model",
+                                          batch_size=1, disable=("parser", "ner"))
+    assert calls == ["test_model"]
+    assert [len(tokens) for tokens in pos] == [3, 1]
+    assert ner == [[], []]
+    load_model.cache_clear()
+
+
+# Test case for tokenize_corpus() with a cache directory
+def test_tokenize_corpus_cache(tmp_path):
+    texts_list = ["This is a test.", "Another @my-test.com test!"]
+
+    # The first call tokenizes and stores the texts, the second one reads the same tokens back
+    assert tokenize_corpus(texts_list, cache_dir=tmp_path) == tokenize_corpus(texts_list)
+    assert tokenize_corpus(texts_list, cache_dir=tmp_path) == tokenize_corpus(texts_list)
+    assert len(list(tmp_path.rglob("*.npz"))) == 2
+
+
+# Test case for lemmata_pos_ner_tag() with a cache directory
+def test_lemmata_pos_ner_tag_cache(monkeypatch, tmp_path):
+    # Use a blank English pipeline and record the texts it processes
+    nlp = spacy.blank("en")
+    processed = []
+    original_pipe = nlp.pipe
+
+    def recording_pipe(texts, **kwargs):
+        texts = list(texts)
+        processed.extend(texts)
+        return original_pipe(texts, **kwargs)
+
+    monkeypatch.setattr(nlp, "pipe", recording_pipe)
+    monkeypatch.setattr(spacy, "load", lambda model_name: nlp)
+    load_model.cache_clear()
+
+    # Only the texts missing from the cache are annotated
+    first = lemmata_pos_ner_tag(["One text", "Two texts"], model_name="test_model", cache_dir=tmp_path)
+    second = lemmata_pos_ner_tag(["Two texts", "Three texts"], model_name="test_model", cache_dir=tmp_path)
+    assert processed == ["One text", "Two texts", "Three texts"]
+    assert second[1][0] == first[1][1]
+    load_model.cache_clear()
+
+
+# Test case for stream_texts() function
+def test_stream_texts(tmp_path):
+    (tmp_path / "b.txt").write_text("Second text")
+    (tmp_path / "a.txt").write_text("First text")
+    (tmp_path / "c.csv").write_text("Not a text")
+
+    # The texts are yielded lazily, one pair at a time, in file name order
+    texts = stream_texts(tmp_path)
+    assert next(texts) == ("a.txt", "First text")
+    assert list(texts) == [("b.txt", "Second text")]
+
+
+# Test case for summarize_segments() function
+def test_summarize_segments():
+    segments = [["a", "b", "a"], ["b", "c"]]
+    assert summarize_segments(segments) == (2, Counter({"b": 2, "a": 1, "c": 1}))
+
+
+# Test case for stream_segment_summaries() and zeta_from_summaries() functions
+def test_stream_segment_summaries():
+    texts = [("t1.txt", "A b. A c!"), ("t2.txt", "B b, c"), ("r1.txt", "C d")]
+
+    # Each text is reduced to its segments count and the feature counts
+    summaries = list(stream_segment_summaries(texts, 2))
+    assert summaries[0] == ("t1.txt", 2, Counter({"a": 2, "b": 1, "c": 1}))
+
+    # The result matches the one computed on the tokenized and segmented corpus
+    tokens = tokenize_corpus(lowercase_corpus([text for _, text in texts]))
+    segments = build_segments_corpus(tokens, 2)
+    expected = zeta_all_features(segments[:2], segments[2:]).set_index('Feature').sort_index()
+    result = zeta_from_summaries(iter(summaries), {"t1", "t2"}).set_index('Feature').sort_index()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+# Test case for zeta_from_counters() function
+def test_zeta_from_counters():
+    # Features of either counter are scored, counting zero segments where they are missing
+    result = zeta_from_counters(Counter({"a": 2, "b": 1}), Counter({"b": 2, "c": 1}), 2, 4).set_index('Feature')
+    assert result['Target Segments with Feature'].to_dict() == {"a": 2, "b": 1, "c": 0}
+    assert result['Zeta Value'].to_dict() == pytest.approx({"a": 1.0, "b": 0.0, "c": -0.25})
+
+
+# Test case for tokenize_fast() function
+def test_tokenize_fast():
+    # Lowercasing, punctuation removal and splitting happen at once
+    assert tokenize_fast("Hello, world!") == tokenize(lowercase("Hello, world!")) == ["hello", "world"]
+    assert tokenize_fast("This is a test @123 http") == ["this", "is", "a", "test", "123", "http"]
+
+    # Punctuation within a word splits it, where tokenize() joins its parts
+    assert tokenize_fast("Don't stop-me") == ["don", "t", "stop", "me"]
+    assert tokenize(lowercase("Don't stop-me")) == ["dont", "stopme"]
+
+    # With a vocabulary, token IDs are returned
+    vocabulary = Vocabulary()
+    assert tokenize_fast("The cat, the dog", vocabulary).tolist() == [0, 1, 0, 2]
+    assert vocabulary.features == ["the", "cat", "dog"]
+
+
+# Test case for map_texts() function
+def test_map_texts():
+    texts = ["First TEXT", "second text!", "Third, text"]
+
+    # Worker processes return the same results, in the same order
+    assert map_texts(tokenize_fast, texts, n_process=2) == map_texts(tokenize_fast, texts)
+    assert worker_count(-1) == os.cpu_count() and worker_count(3) == 3
+
+
+# Test case for tokenize_corpus() with the fast tokenizer
+def test_tokenize_corpus_fast(tmp_path):
+    texts_list = ["This is a test.", "Another @my-test test!"]
+    expected_result = [["this", "is", "a", "test"], ["another", "my", "test", "test"]]
+
+    # The fast tokenizer can be combined with the cache and with the vocabulary
+    assert tokenize_corpus(texts_list, fast=True) == expected_result
+    assert tokenize_corpus(texts_list, cache_dir=tmp_path, fast=True) == expected_result
+    assert tokenize_corpus(texts_list, cache_dir=tmp_path, fast=True) == expected_result
+    assert tokenize_corpus(texts_list, cache_dir=tmp_path) == tokenize_corpus(texts_list)
+    encoded = tokenize_corpus(texts_list, fast=True, vocabulary=Vocabulary())
+    assert [tokens.tolist() for tokens in encoded] == [[0, 1, 2, 3], [4, 5, 3, 3]]
+
+
+# Test case for compute_zeta() function
+def test_compute_zeta():
+    target = [[["a", "b"], ["a", "c"]], [["a"], ["b"]]]
+    reference = [[["b", "c"], ["c"]]]
+
+    # Only the specified features are evaluated, unknown ones with zero ratios
+    result = compute_zeta(target, reference, ["c", "a", "unknown"])
+    assert result['Feature'].tolist() == ["a", "unknown", "c"]
+    assert result['Zeta Value'].tolist() == pytest.approx([0.75, 0.0, 0.25 - 1.0])
+    pd.testing.assert_frame_equal(compute_zeta(target, reference), zeta_all_features(target, reference))
+
+
+# Test case for the ZetaResults class
+def test_zeta_results():
+    # Start with a capacity smaller than the number of results
+    results = ZetaResults(capacity=1)
+    results.append("a", 0.5, 0.25, 0.25)
+    results.extend(["b", "c", "d"], [0.1, 0.9, 0.4], [0.3, 0.1, 0.4], [-0.2, 0.8, 0.0])
+    results.append("e", 0.0, 0.5, -0.5)
+    assert len(results) == 5
+
+    # The dataframe has the same columns as the summary built by fill_dataframe()
+    expected = pd.DataFrame({'Feature': ["a", "b", "c", "d", "e"],
+                             'Target Partition Ratio': [0.5, 0.1, 0.9, 0.4, 0.0],
+                             'Reference Partition Ratio': [0.25, 0.3, 0.1, 0.4, 0.5],
+                             'Zeta Value': [0.25, -0.2, 0.8, 0.0, -0.5]})
+    pd.testing.assert_frame_equal(results.to_dataframe(), expected, check_dtype=False)
+
+    # Top and bottom results are extracted already sorted
+    assert results.top_k(2)['Feature'].tolist() == ["c", "a"]
+    assert results.top_k(2, largest=False)['Feature'].tolist() == ["e", "b"]
+    assert results.top_k(1, column='Reference Partition Ratio')['Feature'].tolist() == ["e"]
+    with pytest.raises(ValueError):
+        results.top_k(1, column='Feature')
+    with pytest.raises(ValueError):
+        results.top_k(1, column='Unknown')
+
+
+# Test case for top_k_indices() and top_k() functions
+def test_top_k():
+    values = np.array([3, 1, 5, 2, 4])
+    assert top_k_indices(values, 2).tolist() == [2, 4]
+    assert top_k_indices(values, 2, largest=False).tolist() == [1, 3]
+    assert top_k_indices(values, 10).tolist() == [2, 4, 0, 3, 1]
+    assert top_k_indices(values, 0).tolist() == []
+
+    # The result matches the first rows of sort_descending()
+    df = pd.DataFrame({'Feature': list("abcde"), 'Zeta Value': [0.3, 0.1, 0.5, 0.2, 0.4]})
+    pd.testing.assert_frame_equal(top_k(df, 'Zeta Value', 3), sort_descending(df, 'Zeta Value').head(3))
+
+
+# Test case for document_feature_matrix() function
+def test_document_feature_matrix():
+    segments_column = [[["a", "b", "a"], ["b"]], [], [["a", "c"], ["c"], ["c", "a"]]]
+    vocabulary = {"a": 0, "b": 1, "c": 2}
+
+    # Each cell matches count_segments_with_feature() for that text and feature
+    matrix = document_feature_matrix(segments_column, vocabulary)
+    assert matrix.toarray().tolist() == [[1, 2, 0], [0, 0, 0], [2, 0, 3]]
+    for feature, column in vocabulary.items():
+        expected = count_segments_with_feature(feature_occurs_corpus(segments_column, feature))
+        assert matrix[:, column].toarray().ravel().tolist() == expected
+
+
+# Test case for zeta_one_vs_rest() function
+def test_zeta_one_vs_rest():
+    segments_column = [[["a", "b"], ["a"]], [["b", "c"]], [["c"], ["a", "c"]], [["d"]]]
+    labels = ["x", "y", "z", None]
+
+    # Each group matches a define_partitions() split of the labelled texts
+    result = zeta_one_vs_rest(segments_column, labels)
+    assert sorted(result['Group'].unique()) == ["x", "y", "z"]
+    assert set(result['Feature']) == {"a", "b", "c", "d"}
+    df = pd.DataFrame({'Segments': segments_column[:3], 'Author': labels[:3]})
+    for group in ["x", "y", "z"]:
+        target, reference = define_partitions(df, 'Author', group)
+        expected = compute_zeta(target['Segments'], reference['Segments'], ["a", "b", "c", "d"])
+        actual = result[result['Group'] == group].drop(columns='Group')
+        pd.testing.assert_frame_equal(actual.set_index('Feature').sort_index(),
+                                      expected.set_index('Feature').sort_index(), check_dtype=False)
+
+    # Groups without segments, or without any other segments, are left out instead of raising
+    result = zeta_one_vs_rest(segments_column + [[]], labels + ["w"])
+    assert sorted(result['Group'].unique()) == ["x", "y", "z"]
+    result = zeta_one_vs_rest(segments_column, ["x", "x", "x", None])
+    assert len(result) == 0 and list(result.columns) == ['Group', 'Feature', 'Target Segments with Feature',
+                                                         'Reference Segments with Feature',
+                                                         'Target Partition Ratio', 'Reference Partition Ratio',
+                                                         'Zeta Value']
+
+
+# Create a nested corpus directory for the load_corpus() test cases
+@pytest.fixture
+def nested_corpus(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "sub").mkdir(parents=True)
+    (corpus / "a.txt").write_text("Text a")
+    (corpus / "b.txt").write_text("Text b")
+    (corpus / "notes.csv").write_text("Not a text")
+    (corpus / "sub" / "c.txt").write_text("Text c")
+    return corpus
+
+
+# Test case for load_corpus() reading directories and glob patterns
+def test_load_corpus(nested_corpus):
+    cwd = os.getcwd()
+
+    # A flat directory gives the same dictionary as define_dictionary(), without changing directory
+    assert load_corpus(nested_corpus) == {"a.txt": "Text a", "b.txt": "Text b"}
+    assert os.getcwd() == cwd
+    assert load_corpus(nested_corpus, recursive=True) == {"a.txt": "Text a", "b.txt": "Text b",
+                                                          os.path.join("sub", "c.txt"): "Text c"}
+    assert load_corpus(str(nested_corpus / "*" / "*.txt")) == {os.path.join("sub", "c.txt"): "Text c"}
+    assert load_corpus(str(nested_corpus / "**" / "?.txt"), recursive=True) == load_corpus(nested_corpus,
+                                                                                            recursive=True)
+    with pytest.raises(FileNotFoundError):
+        load_corpus(nested_corpus / "missing")
+
+    # Concurrent calls are safe, since the working directory is never changed
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: load_corpus(nested_corpus, max_workers=2), range(8)))
+    assert all(result == results[0] for result in results)
+
+
+# Test case for load_corpus() and read_archive() reading zip and tar archives
+def test_load_corpus_archives(nested_corpus, tmp_path):
+    expected = {"a.txt": "Text a", "b.txt": "Text b", "sub/c.txt": "Text c"}
+    with zipfile.ZipFile(tmp_path / "corpus.zip", "w") as archive:
+        for name in ["a.txt", "b.txt", "notes.csv", "sub/c.txt"]:
+            archive.write(nested_corpus / name, name)
+    with tarfile.open(tmp_path / "corpus.tar.gz", "w:gz") as archive:
+        for name in ["a.txt", "b.txt", "notes.csv", "sub/c.txt"]:
+            archive.add(nested_corpus / name, name)
+    assert load_corpus(tmp_path / "corpus.zip") == expected
+    assert load_corpus(tmp_path / "corpus.tar.gz") == expected
+    assert read_archive(str(tmp_path / "corpus.zip"), "*.csv") == {"notes.csv": "Not a text"}
+
+
+# Test case for top_k_zeta() function
+def test_top_k_zeta():
+    # Build two partitions with a long tail of rare features
+    rng = np.random.default_rng(0)
+    words = [f"w{i}" for i in range(300)]
+    probabilities = 1 / np.arange(1, 301)
+    probabilities /= probabilities.sum()
+    target = build_segments_corpus([list(rng.choice(words, 400, p=probabilities)) for _ in range(5)], 50)
+    reference = build_segments_corpus([list(rng.choice(words[::-1], 400, p=probabilities)) for _ in range(5)], 50)
+    expected = zeta_all_features(target, reference)
+
+    # The pruned top and bottom values match the fully sorted zeta values
+    top, bottom = top_k_zeta(*build_segments_index(target), *build_segments_index(reference), 10)
+    assert top['Zeta Value'].tolist() == pytest.approx(expected['Zeta Value'].head(10).tolist())
+    assert bottom['Zeta Value'].tolist() == pytest.approx(expected['Zeta Value'].tail(10)[::-1].tolist())
+    assert top['Zeta Value'].is_monotonic_decreasing and bottom['Zeta Value'].is_monotonic_increasing
+    assert list(top.columns) == list(expected.columns)
+    with pytest.raises(ZeroDivisionError):
+        top_k_zeta(*build_segments_index(target), *build_segments_index([]), 10)
+
+    # No feature for k = 0, and lists filled from the other partition when a partition has fewer than k
+    top, bottom = top_k_zeta(*build_segments_index(target), *build_segments_index(reference), 0)
+    assert len(top) == 0 and len(bottom) == 0
+    small_target = [[["a", "b"], ["c"]]]
+    small_reference = [[["a"], ["a", "d"]]]
+    expected = zeta_all_features(small_target, small_reference)
+    top, bottom = top_k_zeta(*build_segments_index(small_target), *build_segments_index(small_reference), 3)
+    assert bottom['Zeta Value'].tolist() == pytest.approx(expected['Zeta Value'].tail(3)[::-1].tolist())
+    top, bottom = top_k_zeta(*build_segments_index(small_target), *build_segments_index(small_reference), 4)
+    assert top['Zeta Value'].tolist() == pytest.approx(expected['Zeta Value'].tolist())
+
+    # Features only found in the other partition outrank the candidates once the k-th value is negative
+    skewed_target = [[["a"], ["b"], ["x"], ["y"]]]
+    skewed_reference = [[["a", "b"]], [["a", "b"]], [["a", "b", "r"]], [["a", "b"]]]
+    expected = zeta_all_features(skewed_target, skewed_reference).nlargest(4, 'Zeta Value')
+    top, bottom = top_k_zeta(*build_segments_index(skewed_target), *build_segments_index(skewed_reference), 4)
+    assert top['Zeta Value'].tolist() == pytest.approx(expected['Zeta Value'].tolist())
+    assert 'r' in top['Feature'].tolist()
+
+
+# Test case for the SegmentStatistics class
+def test_segment_statistics():
+    tokens_lists = [["the", "sea", "the", "ship", "the", "sea"], ["a", "ship"], ["the", "house", "the", "garden"]]
+    segments_column = build_segments_corpus(tokens_lists, 2)
+    statistics = SegmentStatistics.from_tokens(tokens_lists, 2)
+
+    # The same counts as from the segments, without keeping them
+    from_segments = SegmentStatistics.from_segments(segments_column, statistics.vocabulary)
+    assert (statistics.counts != from_segments.counts).nnz == 0
+    assert statistics.segments_count.tolist() == segments_count(pd.Series(segments_column)).tolist() == [3, 1, 2]
+    assert statistics.feature_counts('the').tolist() == count_segments_with_feature(
+        feature_occurs_corpus(segments_column, 'the'))
+    assert statistics.feature_counts('unknown').tolist() == [0, 0, 0]
+
+    # Partitions are row subsets, exposing the columns of the partition dataframes
+    partition = statistics.take([0, 2]).to_dataframe('sea')
+    assert partition.columns.tolist() == ['Segments Count', 'Number of Segments with Feature']
+    assert partition['Segments Count'].tolist() == [3, 2]
+    assert partition['Number of Segments with Feature'].tolist() == [2, 0]
+    assert len(statistics.take([1])) == 1
+
+    # The summary matches the one computed from the segments
+    expected = zeta_all_features([segments_column[0]], segments_column[1:])
+    summary = statistics.zeta([0], [1, 2])
+    pd.testing.assert_frame_equal(summary.set_index('Feature').sort_index(),
+                                  expected.set_index('Feature').sort_index(), check_dtype=False)
+
+    # Statistics sharing a vocabulary are not affected by the features added by the later ones
+    vocabulary = {}
+    first = SegmentStatistics.from_tokens(tokens_lists[:2], 2, vocabulary)
+    second = SegmentStatistics.from_tokens(tokens_lists[2:], 2, vocabulary)
+    assert second.feature_counts('house').tolist() == [1]
+    assert first.feature_counts('house').tolist() == [0, 0]
+    summary = first.zeta([0], [1])
+    assert set(summary['Feature']) == {'the', 'sea', 'ship', 'a'}
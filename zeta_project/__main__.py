@@ -0,0 +1,6 @@
+# Executing the package as a script: python -m zeta_project
+import sys
+
+from zeta_project.cli import main
+
+sys.exit(main())
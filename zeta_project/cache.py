@@ -0,0 +1,46 @@
+# Import the required modules
+import hashlib
+import os
+
+import numpy as np
+
+
+# Bind each cached annotation to the text content and to the model which produced it,
+# so that editing a text or updating the model invalidates the stored entry
+def cache_key(text: str, model_name: str, model_version: str) -> str:
+    """ Returns the hexadecimal SHA-256 digest of the text content together with
+    the name and version of the annotating model."""
+    digest = hashlib.sha256()
+    for part in (model_name, model_version, text):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def cache_path(cache_dir: str, key: str) -> str:
+    """ Returns the path of the cache file for the specified key. Files are spread
+    over sub-directories named after the first two key characters."""
+    return os.path.join(cache_dir, key[:2], key + '.npz')
+
+
+# Store the annotation layers of a text (e.g. tokens, lemmata, POS and NER tags) column by column
+def store_annotation(cache_dir: str, key: str, layers: dict) -> None:
+    """ Stores each annotation layer, a list of strings, as a numpy array within a
+    compressed .npz file. The file is written to a temporary path first and then
+    moved into place, so that an interrupted run never leaves a truncated entry."""
+    path = cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.savez_compressed(file, **{name: np.array(values, dtype=str) for name, values in layers.items()})
+    os.replace(temp_path, path)
+
+
+def load_annotation(cache_dir: str, key: str) -> dict | None:
+    """ Returns a dictionary with the annotation layers stored for the specified key,
+    or None if the key has not been cached yet."""
+    try:
+        with np.load(cache_path(cache_dir, key), allow_pickle=False) as data:
+            return {name: data[name].tolist() for name in data.files}
+    except FileNotFoundError:
+        return None
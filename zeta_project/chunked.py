@@ -0,0 +1,150 @@
+# Import the required modules
+import os
+from collections import Counter
+from collections.abc import Iterable
+from functools import reduce
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from zeta_project.zeta import document_ids, process_pool, read_text, stream_segment_summaries, zeta_from_counters
+
+
+# Segment and feature counts of a part of the corpus, which can be merged with those of the other parts
+class PartialCounts:
+    """ Holds, for each partition label, the total number of segments and a counter with
+    the number of segments containing each feature. Merging is associative and
+    commutative, so the counts of the chunks of a corpus can be combined in any order
+    and grouping into the counts of the whole corpus."""
+
+    def __init__(self, totals: dict | None = None, counts: dict | None = None):
+        self.totals = Counter(totals or {})
+        self.counts = {label: Counter(feature_counts) for label, feature_counts in (counts or {}).items()}
+
+    def add(self, label: str, segments_total: int, feature_counts: Counter):
+        """ Adds the summary of a text, as yielded by stream_segment_summaries(), to the
+        counts of the specified partition label, which cannot be missing."""
+        if pd.isna(label):
+            raise ValueError("Partition label cannot be missing")
+        self.totals[label] += segments_total
+        self.counts.setdefault(label, Counter()).update(feature_counts)
+
+    def update(self, other: 'PartialCounts') -> 'PartialCounts':
+        """ Adds the other counts to these ones, in place, and returns them."""
+        self.totals.update(other.totals)
+        for label, feature_counts in other.counts.items():
+            self.counts.setdefault(label, Counter()).update(feature_counts)
+        return self
+
+    def merge(self, other: 'PartialCounts') -> 'PartialCounts':
+        """ Returns new counts adding up these and the other ones."""
+        return PartialCounts(self.totals, self.counts).update(other)
+
+    def __add__(self, other: 'PartialCounts') -> 'PartialCounts':
+        return self.merge(other)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PartialCounts) and self.totals == other.totals and self.counts == other.counts
+
+    def partition_totals(self, target_label: str) -> tuple[Counter, Counter, int, int]:
+        """ Returns the counters of the segments containing each feature and the total numbers
+        of segments of the target partition, made of the texts with the specified label,
+        and of the reference partition, made of all the other texts."""
+        target_counts = Counter(self.counts.get(target_label, {}))
+        reference_counts = Counter()
+        for label, feature_counts in self.counts.items():
+            if label != target_label:
+                reference_counts.update(feature_counts)
+        target_total = self.totals.get(target_label, 0)
+        return target_counts, reference_counts, target_total, sum(self.totals.values()) - target_total
+
+    def zeta(self, target_label: str) -> pd.DataFrame:
+        """ Returns the zeta summary dataframe, as zeta_all_features() does, for the
+        partitions defined by partition_totals()."""
+        return zeta_from_counters(*self.partition_totals(target_label))
+
+    def save(self, path: str):
+        """ Spills the counts to a compressed .npz file, with one array of features and one of
+        counts for each label. Only string labels can be spilled, so that they are loaded
+        back unchanged."""
+        if not all(isinstance(label, str) for label in self.totals):
+            raise ValueError("Only string partition labels can be spilled")
+        arrays = {'labels': np.array(list(self.totals), dtype=str),
+                  'totals': np.array(list(self.totals.values()), dtype=np.int64)}
+        for i, label in enumerate(self.totals):
+            feature_counts = self.counts.get(label, Counter())
+            arrays[f'features_{i}'] = np.array(list(feature_counts), dtype=str)
+            arrays[f'counts_{i}'] = np.array(list(feature_counts.values()), dtype=np.int64)
+        with open(path, 'wb') as file:
+            np.savez_compressed(file, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'PartialCounts':
+        """ Loads the counts spilled by save()."""
+        with np.load(path) as arrays:
+            labels = arrays['labels'].tolist()
+            counts = {label: dict(zip(arrays[f'features_{i}'].tolist(), arrays[f'counts_{i}'].tolist()))
+                      for i, label in enumerate(labels)}
+            return cls(dict(zip(labels, arrays['totals'].tolist())), counts)
+
+
+# Split the corpus directory into chunks of files, to be processed one at a time
+def chunk_files(specified_path: str, chunk_size: int) -> list[list[str]]:
+    """ Returns the paths of the text files within the specified directory, sorted by
+    name and grouped into lists of at most 'chunk_size' files."""
+    if chunk_size <= 0:
+        raise ValueError("Chunk size cannot be zero")
+    paths = [os.path.join(specified_path, file) for file in sorted(os.listdir(specified_path))
+             if file.endswith('.txt')]
+    return [paths[start:start + chunk_size] for start in range(0, len(paths), chunk_size)]
+
+
+# Stream the texts of a chunk into its segment and feature counts
+def aggregate_chunk(paths: list[str], segment_len: int, labels: dict, spill_path: str | None = None):
+    """ Returns the PartialCounts of the specified text files, each counted under the label
+    its idno (the file name without extension, see document_ids()) is bound to in 'labels'.
+    Texts without a label, or with a missing one (NaN), are skipped. If a spill path is specified, the counts are
+    saved there and the path is returned instead, so that only the path has to be
+    sent back by a worker process."""
+    texts = zip(document_ids(os.path.basename(path) for path in paths), map(read_text, paths))
+    partial_counts = PartialCounts()
+    for idno, segments_total, feature_counts in stream_segment_summaries(texts, segment_len):
+        if not pd.isna(labels.get(idno)):
+            partial_counts.add(labels[idno], segments_total, feature_counts)
+    if spill_path is None:
+        return partial_counts
+    partial_counts.save(spill_path)
+    return spill_path
+
+
+# Combine the counts of the chunks, loading the spilled ones one at a time
+def merge_partials(partials: Iterable) -> PartialCounts:
+    """ Returns the merge of the specified PartialCounts, or of the .npz files they have
+    been spilled to, adding each of them in turn to a single accumulator."""
+    return reduce(PartialCounts.update,
+                  (PartialCounts.load(item) if isinstance(item, (str, os.PathLike)) else item for item in partials),
+                  PartialCounts())
+
+
+# Compute zeta over a corpus directory chunk by chunk, so that only one chunk per process is in memory
+def chunked_zeta(specified_path: str, labels: dict, target_label: str, segment_len: int, chunk_size: int = 100,
+                 n_process: int = 1, spill_dir: str | None = None) -> pd.DataFrame:
+    """ Returns the zeta summary dataframe of the texts within the specified directory, whose
+    target partition is made of the texts with the target label and whose reference
+    partition is made of those with any other label (see aggregate_chunk()). The
+    chunks of 'chunk_size' files are aggregated within 'n_process' worker processes
+    ('-1' uses all the CPU cores) and, if a spill directory is specified, their counts
+    are written there and merged afterwards, which also allows merging counts
+    computed on other machines with merge_partials()."""
+    chunks = chunk_files(specified_path, chunk_size)
+    if spill_dir is not None:
+        os.makedirs(spill_dir, exist_ok=True)
+        spill_paths = [os.path.join(spill_dir, f'chunk-{i:06d}.npz') for i in range(len(chunks))]
+    else:
+        spill_paths = [None] * len(chunks)
+    arguments = (chunks, repeat(segment_len), repeat(labels), spill_paths)
+    if n_process == 1:
+        return merge_partials(map(aggregate_chunk, *arguments)).zeta(target_label)
+    with process_pool(n_process) as executor:
+        return merge_partials(executor.map(aggregate_chunk, *arguments)).zeta(target_label)
@@ -0,0 +1,120 @@
+# Import the required modules
+import argparse
+import sys
+
+from zeta_project.corpus import LazyCorpus
+from zeta_project.ngrams import ngram_zeta
+from zeta_project.profiling import PROFILER, enable_profiling
+from zeta_project.zeta import (document_ids, build_segments_corpus, metadata_lookup, partition_labels,
+                               partition_positions, compute_zeta)
+
+
+# Feature layers which can be segmented, bound to the dataframe column holding them
+LAYERS = {'tokens': 'Tokenized Text', 'lemmata': 'Lemmata', 'pos': 'POS', 'ner': 'NER'}
+
+
+def positive_int(value: str) -> int:
+    """ Converts a command line value to an integer greater than zero."""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than zero: {value}")
+    return number
+
+
+def process_count(value: str) -> int:
+    """ Converts a command line value to a number of worker processes, i.e. an integer
+    greater than zero or '-1' for all the CPU cores."""
+    number = int(value)
+    if number <= 0 and number != -1:
+        raise argparse.ArgumentTypeError(f"must be greater than zero or -1: {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """ Returns the parser of the command line arguments of the non-interactive zeta computation."""
+    parser = argparse.ArgumentParser(prog='zeta-project',
+                                     description="Computes Burrows' Zeta between two partitions of a text corpus.")
+    parser.add_argument('corpus', help="directory, glob pattern or zip/tar archive containing the corpus .txt files")
+    parser.add_argument('metadata', help="metadata TSV file with an 'idno' column matching the file names")
+    parser.add_argument('--column', required=True, help="metadata column used to split the corpus")
+    parser.add_argument('--value', required=True, help="metadata value selecting the target partition")
+    parser.add_argument('--segment-length', type=positive_int, default=5000, help="segment length in tokens")
+    parser.add_argument('--features', nargs='+', default=['all'],
+                        help="features to evaluate, 'all' for the whole vocabulary or @FILE to read "
+                             "one feature per line from FILE")
+    parser.add_argument('--layer', choices=list(LAYERS), default='tokens', help="feature layer to segment")
+    parser.add_argument('--ngram', type=positive_int, default=1,
+                        help="length of the contiguous n-gram features, e.g. '2' for bigrams of the layer")
+    parser.add_argument('--output', default='-', help="CSV file to write the summary to ('-' for stdout)")
+    parser.add_argument('--cache-dir', help="directory caching tokens and SpaCy annotations")
+    parser.add_argument('--n-process', type=process_count, default=1,
+                        help="number of worker processes ('-1' for all CPU cores)")
+    parser.add_argument('--profile', help="write the per-stage timing report to this .json or .csv file")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="also trace the memory peaks of each stage (slower)")
+    return parser
+
+
+def parse_arguments(argv: list | None = None) -> argparse.Namespace:
+    """ Parses the command line arguments of the non-interactive zeta computation."""
+    return build_parser().parse_args(argv)
+
+
+def read_features(values: list) -> list | None:
+    """ Returns the list of features specified on the command line, expanding the
+    @FILE arguments, or None if all the features have to be evaluated."""
+    if values == ['all']:
+        return None
+    features = []
+    for value in values:
+        if value.startswith('@'):
+            with open(value[1:], 'rt', encoding='utf-8') as file:
+                features.extend(line.strip() for line in file if line.strip())
+        else:
+            features.append(value)
+    return features
+
+
+# Run the whole pipeline from the corpus directory to the zeta summary
+def main(argv: list | None = None) -> int:
+    """ Entry point of the command line interface. Reads and segments the corpus, splits it
+    into target and reference partition according to the metadata and writes the zeta
+    summary, sorted by descending zeta values, as CSV. Invalid arguments, metadata or
+    partitions end the program with a one-line message and exit status 2."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        features = read_features(args.features)
+    except OSError as error:
+        parser.error(f"cannot read the features file {error.filename}")
+    try:
+        lookup = metadata_lookup(args.metadata, args.column)
+    except (OSError, ValueError):
+        parser.error(f"cannot read the 'idno' and '{args.column}' columns of the metadata file {args.metadata}")
+    if args.profile:
+        enable_profiling(trace_memory=args.profile_memory)
+    try:
+        corpus = LazyCorpus.from_directory(args.corpus, n_process=args.n_process, cache_dir=args.cache_dir)
+    except OSError:
+        parser.error(f"cannot read the corpus {args.corpus}")
+
+    # Check the partitions before tokenizing or annotating the texts
+    target_rows, reference_rows = partition_positions(partition_labels(document_ids(corpus.idnos), lookup,
+                                                                       args.value))
+    if len(target_rows) == 0:
+        parser.error(f"no text has the value '{args.value}' in the metadata column '{args.column}'")
+    if len(reference_rows) == 0:
+        parser.error(f"all the texts have the value '{args.value}' in the metadata column '{args.column}'")
+
+    tokens = corpus[LAYERS[args.layer]]
+    target = [tokens[i] for i in target_rows]
+    reference = [tokens[i] for i in reference_rows]
+    if args.ngram == 1:
+        summary = compute_zeta(build_segments_corpus(target, args.segment_length),
+                               build_segments_corpus(reference, args.segment_length), features)
+    else:
+        summary = ngram_zeta(target, reference, args.segment_length, [args.ngram], features)
+    summary.to_csv(sys.stdout if args.output == '-' else args.output, index=False)
+    if args.profile:
+        PROFILER.write_report(args.profile)
+    return 0
@@ -0,0 +1,72 @@
+# Import the required modules
+import pandas as pd
+
+from zeta_project.zeta import load_corpus, lowercase_corpus, tokenize_corpus, lemmata_pos_ner_tag
+
+
+# SpaCy components of 'en_core_web_sm' not needed by each annotation layer. Lemmata and
+# POS tags rely on the tagger, the attribute ruler and the lemmatizer, while the entity
+# recognizer has its own token-to-vector layer
+DISABLED_COMPONENTS = {
+    'Lemmata': ('parser', 'ner'),
+    'POS': ('parser', 'ner'),
+    'NER': ('tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer'),
+}
+
+
+# Compute each annotation layer only when it is accessed for the first time
+class LazyCorpus:
+    """ Holds the corpus texts and returns their annotation layers by the dataframe column
+    names used throughout the package: 'Text', 'Tokenized Text', 'Lemmata', 'POS' and
+    'NER'. Each layer is computed on first access and kept afterwards. The tokens do
+    not need SpaCy at all, lemmata and POS tags are computed together without parser
+    and entity recognizer, the NER tags with the entity recognizer alone."""
+
+    def __init__(self, texts: dict, model_name: str = "en_core_web_sm", n_process: int = 1,
+                 batch_size: int = 20, cache_dir: str | None = None):
+        self.idnos = list(texts)
+        self.layers = {'Text': list(texts.values())}
+        self.model_name = model_name
+        self.n_process = n_process
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def from_directory(cls, specified_path: str, **kwargs) -> 'LazyCorpus':
+        """ Creates a corpus from the text files within the specified directory path,
+        glob pattern or archive, loaded by load_corpus()."""
+        return cls(load_corpus(specified_path), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.idnos)
+
+    def __contains__(self, layer: str) -> bool:
+        """ Tells whether the layer has already been computed."""
+        return layer in self.layers
+
+    def __getitem__(self, layer: str) -> list:
+        if layer not in self.layers:
+            self.compute(layer)
+        return self.layers[layer]
+
+    def compute(self, layer: str) -> None:
+        """ Computes the specified layer with the minimal pipeline it needs."""
+        texts = self.layers['Text']
+        if layer == 'Tokenized Text':
+            self.layers[layer] = tokenize_corpus(lowercase_corpus(texts), cache_dir=self.cache_dir,
+                                                 n_process=self.n_process)
+        elif layer in DISABLED_COMPONENTS:
+            lemma, pos, ner = lemmata_pos_ner_tag(texts, model_name=self.model_name, n_process=self.n_process,
+                                                  batch_size=self.batch_size, disable=DISABLED_COMPONENTS[layer],
+                                                  cache_dir=self.cache_dir)
+            if layer == 'NER':
+                self.layers['NER'] = ner
+            else:
+                self.layers['Lemmata'] = lemma
+                self.layers['POS'] = pos
+        else:
+            raise KeyError(f"Unknown layer: {layer}")
+
+    def to_dataframe(self, layers: list) -> pd.DataFrame:
+        """ Returns a dataframe with the 'idno' column and the specified layers."""
+        return pd.DataFrame({'idno': self.idnos, **{layer: self[layer] for layer in layers}})
@@ -0,0 +1,207 @@
+# Import the required modules
+import json
+import os
+from collections.abc import Iterable
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from zeta_project.zeta import build_segments, feature_segment_counts, zeta_table
+
+
+# Intern the string features, so that each of them is stored only once and the
+# texts can be represented as arrays of integer IDs
+class Vocabulary:
+    """ Maps string features to consecutive int32 IDs, in order of first occurrence.
+    It can be used wherever a feature -> index dictionary is expected, e.g. by
+    segment_feature_matrix()."""
+
+    def __init__(self, features: Iterable[str] = ()):
+        self.ids = {}
+        self._features = []
+        self.encode(features)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, feature: str) -> bool:
+        return feature in self.ids
+
+    def __getitem__(self, feature: str) -> int:
+        return self.ids[feature]
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def get(self, feature: str, default: int | None = None) -> int | None:
+        """ Returns the ID of the feature, or the default value if it is unknown."""
+        return self.ids.get(feature, default)
+
+    @property
+    def features(self) -> list[str]:
+        """ The list of the features, where each feature is found at the position of its ID."""
+        if len(self._features) < len(self.ids):
+            self._features.extend(islice(self.ids, len(self._features), None))
+        return self._features
+
+    def encode(self, tokens: Iterable[str]) -> np.ndarray:
+        """ Returns an int32 array with the IDs of the specified tokens. Unknown tokens
+        are added to the vocabulary."""
+        ids = self.ids
+        return np.array([ids.setdefault(token, len(ids)) for token in tokens], dtype=np.int32)
+
+    def decode(self, token_ids: Iterable[int]) -> list[str]:
+        """ Returns the list of the features bound to the specified IDs."""
+        features = self.features
+        return [features[token_id] for token_id in token_ids]
+
+
+# Store all the corpus texts within one contiguous token ID buffer
+class EncodedCorpus:
+    """ Holds the texts of a corpus as a single int32 buffer of token IDs. The
+    i-th text spans the buffer from offsets[i] up to offsets[i + 1] (excluded).
+    Texts and segments are returned as views on the buffer, never as copies."""
+
+    def __init__(self, tokens: np.ndarray, offsets: np.ndarray, vocabulary: Vocabulary):
+        self.tokens = tokens
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def lengths(self) -> np.ndarray:
+        """ Returns the number of tokens of each text."""
+        return np.diff(self.offsets)
+
+    def document(self, i: int) -> np.ndarray:
+        """ Returns the token IDs of the i-th text."""
+        return self.tokens[self.offsets[i]:self.offsets[i + 1]]
+
+    def segments(self, i: int, segment_len: int) -> list[np.ndarray]:
+        """ Returns the segments of the i-th text, as build_segments() does."""
+        return build_segments(self.document(i), segment_len)
+
+    def segments_count(self, segment_len: int) -> np.ndarray:
+        """ Returns the number of segments of the specified length of each text."""
+        if segment_len <= 0:
+            raise ValueError("Segment length cannot be zero")
+        return -(-self.lengths() // segment_len)
+
+    def segment_offsets(self, segment_len: int) -> np.ndarray:
+        """ Returns the buffer position at which each segment of the specified length starts,
+        followed by the buffer length, so that the j-th segment spans the buffer from
+        offsets[j] up to offsets[j + 1] (excluded)."""
+        counts = self.segments_count(segment_len)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        starts = np.repeat(self.offsets[:-1], counts) + local * segment_len
+        return np.append(starts, self.offsets[-1])
+
+    def segment_matrix(self, segment_len: int, documents: np.ndarray | None = None) -> sparse.csr_matrix:
+        """ Returns the sparse binary segments x vocabulary matrix, as segment_feature_matrix()
+        does, for the specified text positions (all the texts by default). The segment
+        of each token is derived from its position, so no segment is materialized."""
+        if documents is None:
+            documents = np.arange(len(self))
+        documents = np.asarray(documents, dtype=np.int64)
+        lengths = self.lengths()[documents]
+        segment_starts = np.concatenate(([0], np.cumsum(self.segments_count(segment_len)[documents])))
+        # Position of each selected token within its own text and within the token buffer
+        local = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(self.offsets[documents], lengths) + local
+        rows = np.repeat(segment_starts[:-1], lengths) + local // segment_len
+        matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, self.tokens[positions])),
+                                   shape=(segment_starts[-1], len(self.vocabulary)))
+        # Repeated tokens within a segment have been summed up, only their presence matters
+        matrix.data = np.ones(matrix.nnz, dtype=np.int8)
+        return matrix
+
+
+# Encode a corpus of token lists into an array backed corpus
+def encode_corpus(tokens_lists: Iterable[list], vocabulary: Vocabulary | None = None) -> EncodedCorpus:
+    """ Returns an EncodedCorpus with the token IDs of each token list. A new vocabulary
+    is created unless an existing one is specified, in which case it is extended
+    with the unknown tokens."""
+    if vocabulary is None:
+        vocabulary = Vocabulary()
+    encoded = [vocabulary.encode(tokens) for tokens in tokens_lists]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(tokens) for tokens in encoded], out=offsets[1:])
+    tokens = np.concatenate(encoded) if encoded else np.zeros(0, dtype=np.int32)
+    return EncodedCorpus(tokens.astype(np.int32, copy=False), offsets, vocabulary)
+
+
+# Compute zeta for the whole vocabulary of an encoded corpus
+def zeta_encoded(corpus: EncodedCorpus, target_documents: np.ndarray, reference_documents: np.ndarray,
+                 segment_len: int) -> pd.DataFrame:
+    """ Returns the zeta summary dataframe, as zeta_all_features() does, for the
+    partitions made of the specified text positions of an encoded corpus."""
+    target_matrix = corpus.segment_matrix(segment_len, target_documents)
+    reference_matrix = corpus.segment_matrix(segment_len, reference_documents)
+    return zeta_table(corpus.vocabulary.features, feature_segment_counts(target_matrix),
+                      feature_segment_counts(reference_matrix), target_matrix.shape[0], reference_matrix.shape[0])
+
+
+# Files of a prepared corpus bundle
+BUNDLE_INFO = 'info.json'
+BUNDLE_ARRAYS = ('tokens', 'offsets', 'segment_offsets', 'document_segments')
+
+
+# A prepared corpus, as loaded from a bundle written by save_prepared_corpus()
+class PreparedCorpus:
+    """ Holds an encoded corpus together with its segmentation and metadata. The j-th
+    segment spans the token buffer from segment_offsets[j] up to segment_offsets[j + 1]
+    (excluded) and the segments of the i-th text are those from document_segments[i]
+    up to document_segments[i + 1] (excluded). The metadata dataframe has one row for
+    each text, in the same order, with at least the 'idno' column."""
+
+    def __init__(self, corpus: EncodedCorpus, segment_len: int, segment_offsets: np.ndarray,
+                 document_segments: np.ndarray, metadata: pd.DataFrame):
+        self.corpus = corpus
+        self.segment_len = segment_len
+        self.segment_offsets = segment_offsets
+        self.document_segments = document_segments
+        self.metadata = metadata
+
+    def segment(self, j: int) -> np.ndarray:
+        """ Returns the token IDs of the j-th segment, as a view on the token buffer."""
+        return self.corpus.tokens[self.segment_offsets[j]:self.segment_offsets[j + 1]]
+
+
+# Write the prepared corpus to a directory of .npy files, which can be memory-mapped later
+def save_prepared_corpus(directory: str, corpus: EncodedCorpus, segment_len: int, metadata: pd.DataFrame) -> None:
+    """ Saves the token buffer, the text offsets, the segment offsets, the vocabulary and
+    the metadata of an encoded corpus segmented with the specified segment length. The
+    metadata dataframe must have one row for each text, in the same order as the texts,
+    with at least the 'idno' column."""
+    if len(metadata) != len(corpus):
+        raise ValueError("The metadata must have one row for each text")
+    os.makedirs(directory, exist_ok=True)
+    arrays = {'tokens': corpus.tokens, 'offsets': corpus.offsets,
+              'segment_offsets': corpus.segment_offsets(segment_len),
+              'document_segments': np.concatenate(([0], np.cumsum(corpus.segments_count(segment_len))))}
+    for name in BUNDLE_ARRAYS:
+        np.save(os.path.join(directory, name + '.npy'), np.ascontiguousarray(arrays[name]))
+    np.save(os.path.join(directory, 'vocabulary.npy'), np.array(corpus.vocabulary.features, dtype=str))
+    metadata.to_csv(os.path.join(directory, 'metadata.tsv'), sep='\t', index=False, encoding='UTF-8')
+    with open(os.path.join(directory, BUNDLE_INFO), 'wt', encoding='utf-8') as file:
+        json.dump({'format': 1, 'segment_len': segment_len}, file)
+
+
+def load_prepared_corpus(directory: str, mmap: bool = True) -> PreparedCorpus:
+    """ Loads a corpus bundle written by save_prepared_corpus(). By default the token and
+    offset arrays are memory-mapped read-only, so loading takes constant time and the
+    pages are shared by all the processes reading the same bundle."""
+    with open(os.path.join(directory, BUNDLE_INFO), 'rt', encoding='utf-8') as file:
+        info = json.load(file)
+    arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r' if mmap else None,
+                            allow_pickle=False)
+              for name in BUNDLE_ARRAYS}
+    vocabulary = Vocabulary(np.load(os.path.join(directory, 'vocabulary.npy'), allow_pickle=False).tolist())
+    metadata = pd.read_csv(os.path.join(directory, 'metadata.tsv'), sep='\t', encoding='UTF-8', dtype=str,
+                           keep_default_na=False)
+    corpus = EncodedCorpus(arrays['tokens'], arrays['offsets'], vocabulary)
+    return PreparedCorpus(corpus, info['segment_len'], arrays['segment_offsets'], arrays['document_segments'],
+                          metadata)
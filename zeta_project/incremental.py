@@ -0,0 +1,87 @@
+# Import the required modules
+import os
+from collections import Counter
+
+import pandas as pd
+
+from zeta_project.zeta import document_ids, read_text, stream_segment_summaries, zeta_from_counters
+
+
+# Keep the counts which zeta is computed from up to date while texts are added,
+# removed or edited, instead of processing the whole corpus again
+class IncrementalZeta:
+    """ Maintains, for each text, its partition, segments count and number of segments
+    containing each feature, together with the per-partition totals that total_count()
+    computes. Adding, removing or replacing a text only adjusts the totals by the
+    counts of that text."""
+
+    def __init__(self, segment_len: int):
+        if segment_len <= 0:
+            raise ValueError("Segment length cannot be zero")
+        self.segment_len = segment_len
+        self.documents = {}
+        self.signatures = {}
+        self.segments_total = {True: 0, False: 0}
+        self.feature_counts = {True: Counter(), False: Counter()}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, idno: str) -> bool:
+        return idno in self.documents
+
+    def add_document(self, idno: str, text: str, is_target: bool) -> None:
+        """ Adds a text to the target or reference partition. A text already known
+        under the same name is replaced."""
+        if idno in self.documents:
+            self.remove_document(idno)
+        _, segments_total, feature_counts = next(stream_segment_summaries([(idno, text)], self.segment_len))
+        self.documents[idno] = (is_target, segments_total, feature_counts)
+        self.segments_total[is_target] += segments_total
+        self.feature_counts[is_target].update(feature_counts)
+
+    def remove_document(self, idno: str) -> None:
+        """ Removes a text, subtracting its counts from the totals of its partition."""
+        is_target, segments_total, feature_counts = self.documents.pop(idno)
+        self.signatures.pop(idno, None)
+        self.segments_total[is_target] -= segments_total
+        totals = self.feature_counts[is_target]
+        for feature, count in feature_counts.items():
+            remaining = totals[feature] - count
+            if remaining:
+                totals[feature] = remaining
+            else:
+                del totals[feature]
+
+    def sync(self, specified_path: str, target_idnos: set) -> tuple[list, list, list]:
+        """ Brings the model in line with the text files within the specified directory path.
+        Only the files which are new, or whose size or modification time changed, are
+        read again, and the texts whose file disappeared are removed. Texts are identified
+        by their idno, the file name without extension (see document_ids()), and those in
+        'target_idnos' belong to the target partition. Returns the lists of the added,
+        updated and removed idnos."""
+        added, updated = [], []
+        current = set()
+        with os.scandir(specified_path) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(".txt"):
+                    continue
+                idno = document_ids([entry.name])[0]
+                current.add(idno)
+                stat = entry.stat()
+                signature = (stat.st_size, stat.st_mtime_ns, idno in target_idnos)
+                if self.signatures.get(idno) == signature:
+                    continue
+                (updated if idno in self.documents else added).append(idno)
+                self.add_document(idno, read_text(entry.path), idno in target_idnos)
+                self.signatures[idno] = signature
+        removed = [idno for idno in self.documents if idno not in current]
+        for idno in removed:
+            self.remove_document(idno)
+        return added, updated, removed
+
+    def scores(self) -> pd.DataFrame:
+        """ Returns the zeta summary dataframe, as zeta_all_features() does, from the
+        current partition totals."""
+        return zeta_from_counters(self.feature_counts[True], self.feature_counts[False],
+                                  self.segments_total[True], self.segments_total[False])
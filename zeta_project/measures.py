@@ -0,0 +1,86 @@
+# Import the required modules
+import numpy as np
+import pandas as pd
+
+from zeta_project.zeta import build_vocabulary, segment_feature_matrix, sort_descending
+
+
+# Gather the count tables of a partition, from which all the measures are derived
+def partition_tables(segments_column: list, vocabulary: dict) -> dict:
+    """ Returns a dictionary with the segments x vocabulary frequency matrix of a partition
+    ('frequencies'), the number of tokens of each segment ('lengths'), the number of segments
+    containing each feature ('segment_counts'), the total frequency of each feature
+    ('totals') and the mean of its relative frequencies within the segments ('relative')."""
+    frequencies = segment_feature_matrix(segments_column, vocabulary, binary=False)
+    lengths = np.array([len(segment) for segments in segments_column for segment in segments], dtype=np.int64)
+    if len(lengths) == 0:
+        raise ZeroDivisionError("Division by zero is not allowed")
+    size = frequencies.shape[1]
+    rows = np.repeat(np.arange(frequencies.shape[0]), np.diff(frequencies.indptr))
+    return {'frequencies': frequencies, 'lengths': lengths,
+            'segment_counts': np.bincount(frequencies.indices, minlength=size),
+            'totals': np.bincount(frequencies.indices, weights=frequencies.data, minlength=size),
+            'relative': np.bincount(frequencies.indices, weights=frequencies.data / lengths[rows],
+                                    minlength=size) / len(lengths)}
+
+
+# Measure how evenly each feature is spread over the segments of a partition
+def deviation_of_proportions(tables: dict) -> np.ndarray:
+    """ Returns Gries' deviation of proportions (DP) of each feature over the segments of a
+    partition: half the sum, over all segments, of the absolute difference between the
+    share of the feature occurrences found in the segment and the share of the
+    partition tokens found in the segment. DP is 0 for a perfectly even dispersion;
+    features missing from the partition get the value 1."""
+    frequencies, lengths, totals = tables['frequencies'], tables['lengths'], tables['totals']
+    segment_shares = lengths / lengths.sum()
+    rows = np.repeat(np.arange(frequencies.shape[0]), np.diff(frequencies.indptr))
+    feature_shares = frequencies.data / totals[frequencies.indices]
+    # Segments without the feature contribute their own share, which sums to 1 over all
+    # segments, so only the segments containing the feature have to be visited
+    corrections = np.abs(feature_shares - segment_shares[rows]) - segment_shares[rows]
+    dispersion = 0.5 * (1 + np.bincount(frequencies.indices, weights=corrections, minlength=len(totals)))
+    return np.where(totals > 0, dispersion, 1.0)
+
+
+# Compute the Zeta variants of the literature from the count tables of both partitions
+def zeta_variants(target: list, reference: list) -> pd.DataFrame:
+    """ Returns a dataframe with, for all the features of the target and reference segments
+    columns, the document proportions (partition ratios) and the mean relative frequencies
+    of each partition, and the following measures:
+
+    - 'sd0': difference of the document proportions, i.e. the original zeta value
+    - 'sd2': difference of the log2-transformed document proportions
+    - 'sr0' and 'sr2': the same differences computed on the mean relative frequencies
+    - 'dd0' and 'dr0': ratio of the document proportions and of the relative frequencies
+    - 'Eta': difference of the deviation of proportions (see deviation_of_proportions())
+      of the reference and of the target partition, positive for features more
+      evenly dispersed over the target segments
+
+    Before the log-transformation and the division, the proportions are smoothed with
+    half a segment added to each count and the mean relative frequencies with the relative
+    frequency of half a token within a segment of the mean length of both partitions, so
+    that missing features do not produce infinite values. The dataframe is sorted by
+    descending 'sd0' values."""
+    vocabulary = build_vocabulary(target, reference)
+    tables = [partition_tables(target, vocabulary), partition_tables(reference, vocabulary)]
+    proportions = [t['segment_counts'] / len(t['lengths']) for t in tables]
+    relative = [t['relative'] for t in tables]
+    smoothed_proportions = [(t['segment_counts'] + 0.5) / (len(t['lengths']) + 1) for t in tables]
+    # The same smoothing for both partitions, so that equal relative frequencies give sr2 = 0 and dr0 = 1
+    half_token = 0.5 / np.concatenate([t['lengths'] for t in tables]).mean()
+    smoothed_relative = [r + half_token for r in relative]
+    dispersion = [deviation_of_proportions(t) for t in tables]
+    result = pd.DataFrame({
+        'Feature': list(vocabulary),
+        'Target Partition Ratio': proportions[0],
+        'Reference Partition Ratio': proportions[1],
+        'Target Relative Frequency': relative[0],
+        'Reference Relative Frequency': relative[1],
+        'sd0': proportions[0] - proportions[1],
+        'sd2': np.log2(smoothed_proportions[0]) - np.log2(smoothed_proportions[1]),
+        'sr0': relative[0] - relative[1],
+        'sr2': np.log2(smoothed_relative[0]) - np.log2(smoothed_relative[1]),
+        'dd0': smoothed_proportions[0] / smoothed_proportions[1],
+        'dr0': smoothed_relative[0] / smoothed_relative[1],
+        'Eta': dispersion[1] - dispersion[0]})
+    return sort_descending(result, 'sd0').reset_index(drop=True)
@@ -0,0 +1,119 @@
+# Import the required modules
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from zeta_project.encoding import EncodedCorpus, encode_corpus
+from zeta_project.zeta import sort_descending, zeta_table
+
+
+# Odd 64 bit multiplier of the polynomial hash (the FNV-1 prime)
+HASH_BASE = np.uint64(0x100000001B3)
+
+
+# Hash every window of n consecutive token IDs to a single integer, instead of building string tuples
+def rolling_hashes(tokens: np.ndarray, n: int) -> np.ndarray:
+    """ Returns the uint64 polynomial hash of each window of 'n' consecutive token IDs,
+    so that the i-th value identifies the n-gram starting at position i. All the
+    windows are hashed at once, with one vectorized multiply-add per n-gram position
+    wrapping around modulo 2**64. The hash is seeded with 'n', so that n-grams of
+    different lengths are told apart."""
+    if n <= 0:
+        raise ValueError("N-gram length cannot be zero")
+    count = len(tokens) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    # Shift the IDs by one, so that the ID 0 still contributes to the hash
+    ids = np.asarray(tokens).astype(np.uint64) + np.uint64(1)
+    hashes = np.full(count, n, dtype=np.uint64)
+    for k in range(n):
+        hashes = hashes * HASH_BASE + ids[k:k + count]
+    return hashes
+
+
+# Find the n-grams lying within the segments of an encoded corpus
+def segment_ngrams(corpus: EncodedCorpus, segment_len: int, n_values: Iterable[int]) -> tuple:
+    """ Returns four aligned arrays with the segment, the hash, the buffer position and the
+    length of each n-gram, for all the specified n-gram lengths, whose tokens all lie
+    within the same segment. N-grams crossing a segment (or text) boundary are
+    dropped, as they do not occur in any single segment."""
+    segment_offsets = corpus.segment_offsets(segment_len)
+    segments, hashes, starts, lengths = [], [], [], []
+    for n in n_values:
+        window_hashes = rolling_hashes(corpus.tokens, n)
+        window_starts = np.arange(len(window_hashes))
+        first = np.searchsorted(segment_offsets, window_starts, side='right') - 1
+        last = np.searchsorted(segment_offsets, window_starts + n - 1, side='right') - 1
+        inside = first == last
+        segments.append(first[inside])
+        hashes.append(window_hashes[inside])
+        starts.append(window_starts[inside])
+        lengths.append(np.full(int(inside.sum()), n))
+    return (np.concatenate(segments).astype(np.int64), np.concatenate(hashes).astype(np.uint64),
+            np.concatenate(starts).astype(np.int64), np.concatenate(lengths).astype(np.int64))
+
+
+# Compute zeta for all the n-grams of an encoded corpus, decoding only the distinct ones
+def ngram_zeta_encoded(corpus: EncodedCorpus, target_documents: np.ndarray, reference_documents: np.ndarray,
+                       segment_len: int, n_values: Iterable[int] = (2,)) -> pd.DataFrame:
+    """ Returns the zeta summary dataframe, as zeta_encoded() does, whose features are the
+    contiguous n-grams of the specified lengths, joined by spaces (e.g. 'of course').
+    Each segment counts once for every distinct n-gram it fully contains. N-grams
+    are handled as hashes throughout and only the distinct ones are decoded into
+    strings, from the position of their first occurrence. N-grams missing from both
+    partitions are left out."""
+    segments, hashes, starts, lengths = segment_ngrams(corpus, segment_len, sorted(set(n_values)))
+
+    # Keep a single occurrence of each n-gram within each segment, as only its presence matters
+    order = np.lexsort((hashes, segments))
+    segments, hashes, starts, lengths = segments[order], hashes[order], starts[order], lengths[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (segments[1:] != segments[:-1]) | (hashes[1:] != hashes[:-1])
+    segments, hashes = segments[first], hashes[first]
+    starts, lengths = starts[first], lengths[first]
+    unique_hashes, first_index, columns = np.unique(hashes, return_index=True, return_inverse=True)
+
+    # Count the segments containing each n-gram within the texts of each partition
+    segments_count = corpus.segments_count(segment_len)
+    documents = np.searchsorted(np.cumsum(segments_count), segments, side='right')
+    counts, totals = [], []
+    for partition in (target_documents, reference_documents):
+        partition = np.asarray(partition, dtype=np.int64)
+        in_partition = np.zeros(len(corpus), dtype=bool)
+        in_partition[partition] = True
+        counts.append(np.bincount(columns[in_partition[documents]], minlength=len(unique_hashes)))
+        totals.append(int(segments_count[partition].sum()))
+
+    # N-grams only found in the other texts of the corpus are left out
+    found = np.flatnonzero(counts[0] + counts[1])
+    features = decode_ngrams(corpus, starts[first_index[found]], lengths[first_index[found]])
+    return zeta_table(features, counts[0][found], counts[1][found], totals[0], totals[1])
+
+
+def decode_ngrams(corpus: EncodedCorpus, starts: np.ndarray, lengths: np.ndarray) -> list[str]:
+    """ Returns the n-grams of the specified buffer positions and lengths as strings,
+    joining their tokens by spaces."""
+    features = corpus.vocabulary.features
+    tokens = corpus.tokens
+    return [' '.join(features[token_id] for token_id in tokens[start:start + n])
+            for start, n in zip(starts.tolist(), lengths.tolist())]
+
+
+# Compute zeta for the n-grams of any token layer (tokens, lemmata or POS tags) of two partitions
+def ngram_zeta(target: Iterable[list], reference: Iterable[list], segment_len: int,
+               n_values: Iterable[int] = (2,), features: Iterable[str] | None = None) -> pd.DataFrame:
+    """ Returns the zeta summary dataframe of the contiguous n-grams of the specified
+    lengths, given the token lists (e.g. the 'Tokenized Text', 'Lemmata' or 'POS'
+    column) of the target and reference texts. Over the 'POS' column the features
+    are POS patterns, such as 'ADJ NOUN'. See ngram_zeta_encoded(). If features are
+    specified, only those n-grams are reported and the ones occurring in neither
+    partition get zero ratios, as with compute_zeta()."""
+    target, reference = list(target), list(reference)
+    corpus = encode_corpus(target + reference)
+    summary = ngram_zeta_encoded(corpus, np.arange(len(target)), np.arange(len(target), len(corpus)),
+                                 segment_len, n_values)
+    if features is None:
+        return summary
+    summary = summary.set_index('Feature').reindex(list(dict.fromkeys(features)), fill_value=0)
+    return sort_descending(summary.reset_index(), 'Zeta Value').reset_index(drop=True)
@@ -0,0 +1,181 @@
+# Import the required modules
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+
+# Collect wall time, call counts, processed items and memory peaks of each pipeline stage
+class Profiler:
+    """ Registry of the measures taken by profile_stage() and instrument(). Nothing is
+    measured until the profiler is enabled, so the instrumentation costs a single
+    attribute lookup per call otherwise. Memory peaks are traced with tracemalloc,
+    which slows allocations down noticeably and is therefore enabled separately."""
+
+    columns = ['Stage', 'Calls', 'Total Seconds', 'Max Seconds', 'Items', 'Peak Bytes']
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def enable(self, trace_memory: bool = False) -> None:
+        """ Starts measuring, with memory peaks as well if 'trace_memory' is True."""
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        """ Stops measuring, keeping the measures taken so far."""
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self) -> None:
+        """ Discards the measures taken so far."""
+        with self.lock:
+            self.stages = {}
+
+    def record(self, stage: str, seconds: float, items: int | None, peak: int | None) -> None:
+        """ Adds the measures of a single call to the totals of the stage."""
+        with self.lock:
+            totals = self.stages.setdefault(stage, {'Calls': 0, 'Total Seconds': 0.0, 'Max Seconds': 0.0,
+                                                    'Items': 0, 'Peak Bytes': None})
+            totals['Calls'] += 1
+            totals['Total Seconds'] += seconds
+            totals['Max Seconds'] = max(totals['Max Seconds'], seconds)
+            totals['Items'] += items or 0
+            if peak is not None:
+                totals['Peak Bytes'] = max(totals['Peak Bytes'] or 0, peak)
+
+    def report(self) -> pd.DataFrame:
+        """ Returns a dataframe with the measures of each stage, sorted by descending total time."""
+        with self.lock:
+            rows = [{'Stage': stage, **totals} for stage, totals in self.stages.items()]
+        return pd.DataFrame(rows, columns=self.columns).sort_values(by='Total Seconds', ascending=False,
+                                                                    ignore_index=True)
+
+    def write_report(self, path: str) -> None:
+        """ Writes the report to a .json file, or to a CSV file for any other extension."""
+        report = self.report()
+        if os.path.splitext(path)[1].lower() == '.json':
+            with open(path, 'wt', encoding='utf-8') as file:
+                json.dump(json.loads(report.to_json(orient='records')), file, indent=2)
+        else:
+            report.to_csv(path, index=False)
+
+
+# The profiler shared by the whole package
+PROFILER = Profiler()
+
+
+# Measure a block of code as a pipeline stage
+@contextmanager
+def profile_stage(stage: str, items: int | None = None, profiler: Profiler = PROFILER):
+    """ Context manager recording the wall time of the enclosed block, and its tracemalloc
+    peak above the memory in use when entering it, under the specified stage name.
+    Stages can be nested: the peak of an outer stage includes those of the inner ones."""
+    if not profiler.enabled:
+        yield
+        return
+    trace_memory = profiler.trace_memory and tracemalloc.is_tracing()
+    stack = profiler.local.__dict__.setdefault('stack', [])
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        stack.append({'start': current, 'peak': current})
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            frame = stack.pop()
+            frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            peak = frame['peak'] - frame['start']
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+            tracemalloc.reset_peak()
+        profiler.record(stage, seconds, items, peak)
+
+
+def count_items(argument) -> int:
+    """ Returns the length of a collection argument, or 1 for strings and for
+    arguments without an unambiguous length, such as sparse matrices."""
+    if isinstance(argument, (str, bytes)):
+        return 1
+    try:
+        return len(argument)
+    except TypeError:
+        return 1
+
+
+# Measure every call of a function as a pipeline stage named after it
+def instrument(function):
+    """ Decorator recording each call of the function with profile_stage(). The number of
+    processed items is the length of the first argument if it is a collection, e.g. the
+    texts or the segments passed to the function, and 1 otherwise. For generator
+    functions the time spent producing the values is summed over the whole iteration
+    and the number of items is the number of yielded values; memory is not traced."""
+    stage = function.__qualname__
+
+    if inspect.isgeneratorfunction(function):
+        @wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return (yield from function(*args, **kwargs))
+            iterator = function(*args, **kwargs)
+            seconds = 0.0
+            items = 0
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        value = next(iterator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        seconds += time.perf_counter() - start
+                    items += 1
+                    yield value
+            finally:
+                PROFILER.record(stage, seconds, items, None)
+
+        return generator_wrapper
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.enabled:
+            return function(*args, **kwargs)
+        with profile_stage(stage, count_items(args[0] if args else None)):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def enable_profiling(trace_memory: bool = False) -> None:
+    """ Starts measuring the instrumented functions with the shared profiler."""
+    PROFILER.enable(trace_memory)
+
+
+def disable_profiling() -> None:
+    """ Stops measuring the instrumented functions with the shared profiler."""
+    PROFILER.disable()
+
+
+# Opt in from the environment, e.g. ZETA_PROFILE=1 or ZETA_PROFILE=memory
+if os.environ.get('ZETA_PROFILE'):
+    enable_profiling(trace_memory=os.environ['ZETA_PROFILE'].lower() == 'memory')
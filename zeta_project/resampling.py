@@ -0,0 +1,117 @@
+# Import the required modules
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from zeta_project.zeta import build_vocabulary, segment_feature_matrix, document_feature_matrix, process_pool
+
+
+# Build the count matrix of the resampling units (texts or segments) of both partitions
+def resampling_tables(target: list, reference: list, unit: str = 'document') -> tuple:
+    """ Returns the features, a sparse matrix with one row for each resampling unit and one
+    column for each feature, holding the number of segments of the unit containing the
+    feature, the number of segments of each unit and a boolean array telling which
+    units belong to the target partition. Units are the texts ('document') or the
+    segments ('segment') of the target and reference segments columns."""
+    vocabulary = build_vocabulary(target, reference)
+    segments = list(target) + list(reference)
+    if unit == 'document':
+        matrix = document_feature_matrix(segments, vocabulary)
+        sizes = np.array([len(text_segments) for text_segments in segments], dtype=np.int64)
+        is_target = np.arange(len(segments)) < len(target)
+    elif unit == 'segment':
+        matrix = segment_feature_matrix(segments, vocabulary).astype(np.int32)
+        sizes = np.ones(matrix.shape[0], dtype=np.int64)
+        is_target = np.arange(matrix.shape[0]) < sum(len(text_segments) for text_segments in target)
+    else:
+        raise ValueError("The resampling unit must be 'document' or 'segment'")
+    return list(vocabulary), matrix.tocsr(), sizes, is_target
+
+
+def weighted_ratios(matrix: sparse.csr_matrix, sizes: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """ Returns, for each row of the weights (resamples x units), the ratio of the weighted
+    number of segments containing each feature over the weighted number of segments."""
+    counts = (matrix.T @ weights.T).T
+    totals = weights @ sizes
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return counts / totals[:, None]
+
+
+def observed_zeta(matrix: sparse.csr_matrix, sizes: np.ndarray, is_target: np.ndarray) -> np.ndarray:
+    """ Returns the zeta value of each feature for the given partition of the units."""
+    weights = np.vstack([is_target, ~is_target]).astype(np.float64)
+    ratios = weighted_ratios(matrix, sizes, weights)
+    return ratios[0] - ratios[1]
+
+
+# Draw a chunk of bootstrap resamples within each partition, in a worker process
+def bootstrap_chunk(matrix: sparse.csr_matrix, sizes: np.ndarray, is_target: np.ndarray, n_resamples: int,
+                    seed: np.random.SeedSequence) -> np.ndarray:
+    """ Returns the zeta values (resamples x features, float32) of 'n_resamples' bootstrap
+    resamples, drawing the units of each partition with replacement."""
+    rng = np.random.default_rng(seed)
+    ratios = []
+    for units in (np.flatnonzero(is_target), np.flatnonzero(~is_target)):
+        draws = rng.integers(0, len(units), size=(n_resamples, len(units)))
+        weights = np.zeros((n_resamples, len(units)))
+        np.add.at(weights, (np.arange(n_resamples)[:, None], draws), 1)
+        ratios.append(weighted_ratios(matrix[units], sizes[units], weights))
+    return (ratios[0] - ratios[1]).astype(np.float32)
+
+
+# Shuffle the partition labels of the units for a chunk of resamples, in a worker process
+def permutation_chunk(matrix: sparse.csr_matrix, sizes: np.ndarray, is_target: np.ndarray, n_resamples: int,
+                      seed: np.random.SeedSequence) -> np.ndarray:
+    """ Returns, for each feature, the number of 'n_resamples' random relabellings of the
+    units (preserving the partition sizes) whose absolute zeta value is at least the
+    observed one."""
+    rng = np.random.default_rng(seed)
+    observed = np.abs(observed_zeta(matrix, sizes, is_target))
+    weights = np.zeros((n_resamples, len(is_target)))
+    n_target = int(is_target.sum())
+    for row in range(n_resamples):
+        weights[row, rng.permutation(len(is_target))[:n_target]] = 1
+    permuted = weighted_ratios(matrix, sizes, weights) - weighted_ratios(matrix, sizes, 1 - weights)
+    return (np.abs(permuted) >= observed - 1e-12).sum(axis=0)
+
+
+def run_chunks(function, n_resamples: int, seed: int, chunk_size: int, n_process: int) -> list:
+    """ Splits the resamples into chunks of at most 'chunk_size', each with its own random
+    stream spawned from the seed, and runs the function on them within 'n_process'
+    worker processes ('-1' uses all the CPU cores). The chunks, and therefore the
+    results, do not depend on the number of processes."""
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if n_process == 1 or len(sizes) < 2:
+        return [function(size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    with process_pool(n_process) as executor:
+        return list(executor.map(function, sizes, seeds))
+
+
+# Estimate how stable the zeta value of every feature is, and whether it differs from chance
+def zeta_significance(target: list, reference: list, unit: str = 'document', n_bootstrap: int = 1000,
+                      n_permutations: int = 1000, confidence: float = 0.95, n_process: int = 1, seed: int = 0,
+                      chunk_size: int = 100) -> pd.DataFrame:
+    """ Returns a dataframe with the zeta value of each feature of the target and reference
+    segments columns, the bounds of its bootstrap percentile confidence interval at the
+    specified confidence level ('CI Low', 'CI High') and the p-value of the two-sided
+    label permutation test ('P Value'), sorted by descending zeta values. The texts or
+    the segments (see resampling_tables()) are resampled, vectorized over the whole
+    vocabulary and distributed over 'n_process' worker processes; the results are
+    reproducible for a given seed. Bootstrap values are kept as float32, so memory grows
+    with n_bootstrap x vocabulary size."""
+    features, matrix, sizes, is_target = resampling_tables(target, reference, unit)
+    if sizes[is_target].sum() == 0 or sizes[~is_target].sum() == 0:
+        raise ZeroDivisionError("Division by zero is not allowed")
+    bootstrap_seed, permutation_seed = np.random.SeedSequence(seed).generate_state(2)
+    zetas = np.vstack(run_chunks(partial(bootstrap_chunk, matrix, sizes, is_target), n_bootstrap,
+                                 bootstrap_seed, chunk_size, n_process))
+    low, high = np.nanpercentile(zetas, [50 * (1 - confidence), 50 * (1 + confidence)], axis=0)
+    exceedances = sum(run_chunks(partial(permutation_chunk, matrix, sizes, is_target), n_permutations,
+                                 permutation_seed, chunk_size, n_process))
+    result = pd.DataFrame({'Feature': features, 'Zeta Value': observed_zeta(matrix, sizes, is_target),
+                           'CI Low': low, 'CI High': high,
+                           'P Value': (exceedances + 1) / (n_permutations + 1)})
+    return result.sort_values(by='Zeta Value', ascending=False, ignore_index=True)
@@ -0,0 +1,212 @@
+# Import the required modules
+import argparse
+import asyncio
+import json
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from zeta_project.cli import positive_int
+from zeta_project.corpus import LazyCorpus
+from zeta_project.zeta import (document_ids, build_segments_corpus, build_vocabulary,
+                               document_feature_matrix, zeta_table)
+
+
+# Keep the segmented corpus resident as per-text counts, from which any partition can be scored
+class ZetaIndex:
+    """ Holds the number of segments of each text containing each vocabulary feature, the
+    segments count of each text and the metadata of each text, in the same order. A
+    partition is a boolean mask over the texts, so answering a query only sums the
+    counts of the selected texts."""
+
+    def __init__(self, counts: sparse.csr_matrix, segments_count: np.ndarray, vocabulary: dict,
+                 metadata: pd.DataFrame):
+        self.counts = counts.tocsc()
+        self.segments_count = np.asarray(segments_count, dtype=np.int64)
+        self.vocabulary = vocabulary
+        self.features = list(vocabulary)
+        self.metadata = metadata.reset_index(drop=True)
+        self.masks = {}
+
+    @classmethod
+    def from_corpus(cls, corpus_path: str, metadata_path: str, segment_len: int,
+                    layer: str = 'Tokenized Text', **kwargs) -> 'ZetaIndex':
+        """ Loads, annotates and segments the corpus once, joining each text with its row
+        of the metadata TSV by 'idno' (the file name without the '.txt' suffix)."""
+        corpus = LazyCorpus.from_directory(corpus_path, **kwargs)
+        segments = build_segments_corpus(corpus[layer], segment_len)
+        vocabulary = build_vocabulary(segments)
+        idnos = document_ids(corpus.idnos)
+        meta = pd.read_csv(metadata_path, sep='\t', encoding='UTF-8', dtype=str)
+        metadata = meta.drop_duplicates('idno').set_index('idno').reindex(idnos).reset_index()
+        return cls(document_feature_matrix(segments, vocabulary), [len(text) for text in segments], vocabulary,
+                   metadata)
+
+    def partition_mask(self, column: str, value: str) -> np.ndarray:
+        """ Returns the boolean mask of the texts of the target partition, i.e. those whose
+        metadata column holds the specified value. Masks are cached."""
+        key = (column, value)
+        if key not in self.masks:
+            if column not in self.metadata.columns:
+                raise KeyError(f"Unknown metadata column: {column}")
+            self.masks[key] = (self.metadata[column] == value).to_numpy()
+        return self.masks[key]
+
+    def query(self, column: str, value: str, features: list | None = None) -> pd.DataFrame:
+        """ Returns the zeta summary dataframe of the specified features (all by default)
+        for the partition split on the metadata column value."""
+        return self.query_batch(column, value, [features])[0]
+
+    def query_batch(self, column: str, value: str, feature_lists: list) -> list[pd.DataFrame]:
+        """ Answers several queries on the same partition at once: the counts of the union
+        of the requested features are summed only once. Each item of 'feature_lists' is
+        a list of features, or None for all the features."""
+        mask = self.partition_mask(column, value)
+        if any(features is None for features in feature_lists):
+            requested = self.features
+        else:
+            requested = list(dict.fromkeys(feature for features in feature_lists for feature in features))
+        if requested is self.features:
+            known, columns = self.features, self.counts
+        else:
+            known = [feature for feature in requested if feature in self.vocabulary]
+            columns = self.counts[:, [self.vocabulary[feature] for feature in known]]
+        target = columns.T @ mask.astype(np.int64)
+        reference = columns.T @ (~mask).astype(np.int64)
+        totals = {feature: (target[i], reference[i]) for i, feature in enumerate(known)}
+        target_segments = int(self.segments_count[mask].sum())
+        reference_segments = int(self.segments_count[~mask].sum())
+        results = []
+        for features in feature_lists:
+            features = self.features if features is None else list(dict.fromkeys(features))
+            counts = np.array([totals.get(feature, (0, 0)) for feature in features], dtype=np.int64).reshape(-1, 2)
+            results.append(zeta_table(features, counts[:, 0], counts[:, 1], target_segments, reference_segments))
+        return results
+
+
+# Answer concurrent zeta queries over HTTP, batching those on the same partition
+class ZetaService:
+    """ Serves the queries against a resident ZetaIndex. Queries on the same partition
+    arriving within 'batch_window' seconds of each other are answered by a single
+    ZetaIndex.query_batch() call, which runs in a worker thread so that the event
+    loop keeps accepting connections.
+
+    The HTTP interface has two routes: 'GET /health' and 'POST /zeta', whose JSON body
+    has the keys 'column' and 'value' (the target partition), and optionally 'features'
+    (a list, all the features by default) and 'top' (the number of rows to return)."""
+
+    def __init__(self, index: ZetaIndex, batch_window: float = 0.005):
+        self.index = index
+        self.batch_window = batch_window
+        self.pending = {}
+
+    async def submit(self, column: str, value: str, features: list | None = None) -> pd.DataFrame:
+        """ Queues a query and returns its zeta summary dataframe once its batch is answered."""
+        loop = asyncio.get_running_loop()
+        key = (column, value)
+        future = loop.create_future()
+        if key not in self.pending:
+            self.pending[key] = []
+            loop.call_later(self.batch_window, lambda: asyncio.ensure_future(self.flush(key)))
+        self.pending[key].append((features, future))
+        return await future
+
+    async def flush(self, key: tuple) -> None:
+        """ Answers all the queries queued on the partition."""
+        batch = self.pending.pop(key)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, partial(self.index.query_batch, *key,
+                                                                [features for features, _ in batch]))
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+        else:
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    async def answer(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        """ Returns the HTTP status code and the JSON response of a request."""
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'texts': len(self.index.segments_count),
+                         'features': len(self.index.features)}
+        if method != 'POST' or path != '/zeta':
+            return 404, {'error': f"Unknown route: {method} {path}"}
+        try:
+            query = json.loads(body or b'{}')
+            if not isinstance(query, dict):
+                raise TypeError("The request body must be a JSON object")
+            features = query.get('features')
+            if features is not None and not isinstance(features, list):
+                raise TypeError("'features' must be a list of features")
+            top = None if query.get('top') is None else int(query['top'])
+            result = await self.submit(query['column'], query['value'], features)
+        except (ValueError, KeyError, TypeError, ZeroDivisionError) as error:
+            return 400, {'error': str(error)}
+        if top is not None:
+            result = result.head(top)
+        return 200, {'results': result.to_dict(orient='records')}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Reads HTTP/1.1 requests from a connection and writes the JSON responses."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while (line := await reader.readline()).strip():
+                    name, _, header_value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = header_value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, response = await self.answer(method, path, body)
+                payload = json.dumps(response, default=lambda value: value.item()).encode('utf-8')
+                writer.write(f'HTTP/1.1 {status} {"OK" if status == 200 else "Error"}\r\n'
+                             f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n'
+                             .encode('latin-1') + payload)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000, unix_socket: str | None = None):
+        """ Starts listening on the TCP address, or on the Unix socket if one is specified,
+        and returns the asyncio server."""
+        if unix_socket is not None:
+            return await asyncio.start_unix_server(self.handle, path=unix_socket)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(index: ZetaIndex, host: str = '127.0.0.1', port: int = 8000, unix_socket: str | None = None,
+                batch_window: float = 0.005) -> None:
+    """ Serves the queries against the index until the process is stopped."""
+    server = await ZetaService(index, batch_window).start(host, port, unix_socket)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list | None = None) -> None:
+    """ Entry point of the service: python -m zeta_project.service CORPUS METADATA [options]."""
+    parser = argparse.ArgumentParser(prog='zeta-project-service',
+                                     description="Serves zeta queries against a resident, segmented corpus.")
+    parser.add_argument('corpus', help="directory, glob pattern or zip/tar archive containing the corpus")
+    parser.add_argument('metadata', help="metadata TSV file with an 'idno' column matching the file names")
+    parser.add_argument('--segment-length', type=positive_int, default=5000, help="segment length in tokens")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=8000, help="TCP port to listen on")
+    parser.add_argument('--unix-socket', help="Unix socket path to listen on instead of TCP")
+    parser.add_argument('--batch-window', type=float, default=0.005,
+                        help="seconds during which queries on the same partition are batched")
+    args = parser.parse_args(argv)
+    index = ZetaIndex.from_corpus(args.corpus, args.metadata, args.segment_length)
+    asyncio.run(serve(index, args.host, args.port, args.unix_socket, args.batch_window))
+
+
+if __name__ == '__main__':
+    main()
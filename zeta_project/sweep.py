@@ -0,0 +1,55 @@
+# Import the required modules
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from zeta_project.encoding import EncodedCorpus
+
+
+# Build the positional inverted index of an encoded corpus: the positions of each feature
+# are stored next to each other, sorted by text and by position within the text
+def positional_index(corpus: EncodedCorpus) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Returns three equally long arrays, describing every token occurrence of the corpus
+    by its feature ID, its text position and its position within the text. The
+    occurrences are sorted by feature ID, then by text and position."""
+    lengths = corpus.lengths()
+    documents = np.repeat(np.arange(len(corpus)), lengths)
+    positions = np.arange(len(corpus.tokens)) - np.repeat(corpus.offsets[:-1], lengths)
+    order = np.argsort(corpus.tokens, kind='stable')
+    return np.asarray(corpus.tokens)[order], documents[order], positions[order]
+
+
+# Count the segments containing each feature for several segment lengths, deriving the segment
+# of every occurrence from its position instead of segmenting the corpus again
+def zeta_segment_length_sweep(corpus: EncodedCorpus, target_documents: Iterable[int],
+                              reference_documents: Iterable[int], segment_lengths: Iterable[int],
+                              index: tuple | None = None) -> pd.DataFrame:
+    """ Returns a dataframe with one row for each vocabulary feature and one column for each
+    of the specified segment lengths, holding the zeta value of the feature when the
+    texts are split into segments of that length. The positional index is built by
+    positional_index() unless it is specified. Texts in neither partition are ignored."""
+    feature_ids, documents, positions = positional_index(corpus) if index is None else index
+    labels = np.full(len(corpus), -1, dtype=np.int8)
+    labels[np.asarray(list(target_documents), dtype=np.int64)] = 1
+    labels[np.asarray(list(reference_documents), dtype=np.int64)] = 0
+    occurrence_labels = labels[documents]
+    boundaries = np.ones(len(feature_ids), dtype=bool)
+    boundaries[1:] = (feature_ids[1:] != feature_ids[:-1]) | (documents[1:] != documents[:-1])
+    size = len(corpus.vocabulary)
+    result = {}
+    for segment_len in segment_lengths:
+        segments_count = corpus.segments_count(segment_len)
+        segments = positions // segment_len
+        # Occurrences are sorted by feature, text and position, so a segment containing
+        # the feature starts wherever one of these changes
+        first = boundaries.copy()
+        first[1:] |= segments[1:] != segments[:-1]
+        totals = [segments_count[labels == label].sum() for label in (1, 0)]
+        if totals[0] == 0 or totals[1] == 0:
+            raise ZeroDivisionError("Division by zero is not allowed")
+        target_ratios, reference_ratios = (np.bincount(feature_ids[first & (occurrence_labels == label)],
+                                                       minlength=size) / total
+                                           for label, total in zip((1, 0), totals))
+        result[segment_len] = target_ratios - reference_ratios
+    return pd.DataFrame(result, index=pd.Index(corpus.vocabulary.features, name='Feature'))
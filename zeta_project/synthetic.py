@@ -0,0 +1,65 @@
+# Import the required modules
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Build a vocabulary of distinct pseudo-words, the first ones being the shortest
+def synthetic_vocabulary(vocab_size: int, seed: int = 0) -> list[str]:
+    """ Returns a list of distinct lowercase pseudo-words. Shorter words come first,
+    so that, as in natural language, the most frequent ranks get the shortest words."""
+    rng = np.random.default_rng(seed)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    words = []
+    seen = set()
+    length = 2
+    while len(words) < vocab_size:
+        # Draw at most as many words of the current length as there are combinations
+        for _ in range(min(vocab_size - len(words), 26 ** length // 2)):
+            word = ''.join(rng.choice(letters, size=length))
+            if word not in seen:
+                seen.add(word)
+                words.append(word)
+        length += 1
+    return words
+
+
+# Generate a reproducible corpus whose word frequencies follow Zipf's law
+def zipf_corpus(n_docs: int = 100, doc_len: int | tuple = 5000, vocab_size: int = 10000,
+                exponent: float = 1.1, sentence_len: int = 15, seed: int = 0) -> dict:
+    """ Returns a dictionary, shaped like the one defined by define_dictionary(), with
+    'n_docs' synthetic texts. The word of rank r is drawn with probability proportional
+    to 1 / r ** exponent. 'doc_len' is either the number of words of each text or a
+    (minimum, maximum) pair, from which each text length is drawn uniformly. Every
+    'sentence_len' words a sentence ends with a full stop, so that the texts also
+    exercise punctuation removal."""
+    rng = np.random.default_rng(seed)
+    words = np.array(synthetic_vocabulary(vocab_size, seed), dtype=object)
+    probabilities = 1.0 / np.arange(1, vocab_size + 1) ** exponent
+    probabilities /= probabilities.sum()
+    low, high = doc_len if isinstance(doc_len, tuple) else (doc_len, doc_len)
+    corpus = {}
+    for i in range(n_docs):
+        tokens = words[rng.choice(vocab_size, size=int(rng.integers(low, high + 1)), p=probabilities)]
+        sentences = [' '.join(tokens[j:j + sentence_len]) + '.' for j in range(0, len(tokens), sentence_len)]
+        corpus[f'doc{i:05d}.txt'] = ' '.join(sentences).capitalize()
+    return corpus
+
+
+# Write a synthetic corpus and its metadata table to disk
+def write_corpus(directory: str, corpus: dict, n_groups: int = 2, seed: int = 0) -> str:
+    """ Writes each text of the corpus into its own file within the specified directory,
+    together with a 'metadata.tsv' table holding the 'idno' of each text and a 'group'
+    column, which assigns the texts at random to 'n_groups' groups named 'g0', 'g1', etc.
+    Returns the path of the metadata table."""
+    os.makedirs(directory, exist_ok=True)
+    for file, text in corpus.items():
+        with open(os.path.join(directory, file), 'wt', encoding='utf-8') as handle:
+            handle.write(text)
+    rng = np.random.default_rng(seed)
+    meta = pd.DataFrame({'idno': [os.path.splitext(file)[0] for file in corpus],
+                         'group': [f'g{group}' for group in rng.integers(0, n_groups, size=len(corpus))]})
+    meta_path = os.path.join(directory, 'metadata.tsv')
+    meta.to_csv(meta_path, sep='\t', index=False, encoding='UTF-8')
+    return meta_path
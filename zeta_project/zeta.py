@@ -1,13 +1,29 @@
 # Import the required modules
+import fnmatch
+import glob
 import os
 import re
-
+import tarfile
+import zipfile
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
+from scipy import sparse
 import spacy
 
+from zeta_project.cache import cache_key, load_annotation, store_annotation
+from zeta_project.profiling import instrument
+
 
 # Set the proper working directory path
+@instrument
 def set_cwd(current_path: str) -> str:
     """ The function checks whether the specified path matches the
     current working directory path. If yes, the specified path is returned.
@@ -21,6 +37,7 @@ def set_cwd(current_path: str) -> str:
         raise FileNotFoundError("Invalid path")
 
 
+@instrument
 def read_text(filename: str) -> str:
     """ Reads the text file content, returning the specified number of bytes."""
     with open(filename, 'rt', encoding='utf-8') as file:
@@ -29,6 +46,7 @@ def read_text(filename: str) -> str:
 
 # Create a dictionary where text file names are the keys and each text content is the value.
 # In this way each text file is bound to its title/index, when processed later
+@instrument
 def define_dictionary(specified_path: str) -> dict:
     """ Creates a dictionary with the text items from the collection within
     the specified directory path. The dictionary keys correspond to the text
@@ -37,7 +55,73 @@ def define_dictionary(specified_path: str) -> dict:
     return {file: read_text(file) for file in os.listdir() if file.endswith(".txt")}
 
 
+# Suffixes of the archive files load_corpus() can read the texts from
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+# Load the corpus without changing the working directory, reading the files within a pool
+# of threads, so that the latency of slow (e.g. network) file systems overlaps
+@instrument
+def load_corpus(source: str, pattern: str = '*.txt', recursive: bool = False, max_workers: int = 8) -> dict:
+    """ Creates a dictionary with the text items from the specified source, as
+    define_dictionary() does. The source can be a directory path, a glob pattern
+    (e.g. 'corpus/*/novel_*.txt') or a zip or tar archive. Only the files whose name
+    matches 'pattern' are read from directories and archives, also within the
+    sub-directories if 'recursive' is True (always for archives). The dictionary keys
+    are the file paths relative to the directory, to the non-wildcard part of the glob
+    pattern or to the archive root, i.e. the plain file names for a flat directory.
+    Files are read by up to 'max_workers' threads. The working directory is never
+    changed, so the function can be called from several threads at once."""
+    source = os.fspath(source)
+    if os.path.isfile(source) and source.lower().endswith(ARCHIVE_SUFFIXES):
+        return read_archive(source, pattern)
+    if glob.has_magic(source):
+        parts = source.split(os.sep)
+        root = os.sep.join(parts[:next(i for i, part in enumerate(parts) if glob.has_magic(part))]) or os.curdir
+        paths = [path for path in glob.glob(source, recursive=recursive) if os.path.isfile(path)]
+    elif os.path.isdir(source):
+        root = source
+        paths = list(scan_files(source, pattern, recursive))
+    else:
+        raise FileNotFoundError("Invalid path")
+    paths.sort()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        texts = executor.map(read_text, paths)
+        return {os.path.relpath(path, root): text for path, text in zip(paths, texts)}
+
+
+@instrument
+def scan_files(directory: str, pattern: str, recursive: bool) -> Iterator[str]:
+    """ Yields the paths of the files within the directory whose name matches the pattern,
+    scanning the sub-directories as well if 'recursive' is True."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+                yield entry.path
+            elif recursive and entry.is_dir():
+                yield from scan_files(entry.path, pattern, recursive)
+
+
+@instrument
+def read_archive(archive_path: str, pattern: str = '*.txt') -> dict:
+    """ Returns a dictionary with the content of each file within a zip or tar archive
+    whose name matches the pattern, keyed by its path within the archive."""
+    texts = {}
+    if archive_path.lower().endswith('.zip'):
+        with zipfile.ZipFile(archive_path) as archive:
+            for name in sorted(archive.namelist()):
+                if not name.endswith('/') and fnmatch.fnmatch(os.path.basename(name), pattern):
+                    texts[name] = archive.read(name).decode('utf-8')
+    else:
+        with tarfile.open(archive_path) as archive:
+            for member in sorted(archive.getmembers(), key=lambda member: member.name):
+                if member.isfile() and fnmatch.fnmatch(os.path.basename(member.name), pattern):
+                    texts[member.name] = archive.extractfile(member).read().decode('utf-8')
+    return texts
+
+
 # Define a pandas dataframe from dictionary
+@instrument
 def create_df(corpus_dict: dict) -> pd.DataFrame:
     """ Creates a pandas dataframe from a dictionary defined by define_dictionary().
      The dictionary keys are collected under the 'File Name' column and the values
@@ -45,16 +129,24 @@ def create_df(corpus_dict: dict) -> pd.DataFrame:
     return pd.DataFrame(corpus_dict.items(), columns=['idno', 'Text'])
 
 
+@instrument
 def lowercase(text: str) -> str:
     """ Converts strings to lowercase."""
     return text.lower()
 
 
+@instrument
 def lowercase_corpus(texts_col: list) -> list:
     """ Converts string texts within a list to lowercase."""
     return [lowercase(file) for file in texts_col]
 
 
+# Version of the tokenization rules, to be increased whenever tokenize() or tokenize_fast() change
+# so that the tokens cached by previous versions are not used anymore
+TOKENIZER_VERSION = '2'
+
+
+@instrument
 def tokenize(text: str) -> list:
     """ Tokenizes a string text returning a list of tokens.
     Uses the 're' module to remove punctuation."""
@@ -63,32 +155,141 @@ def tokenize(text: str) -> list:
     return tokens
 
 
+# Single precompiled pattern matching the tokens found by tokenize_fast()
+WORD_PATTERN = re.compile(r'\w+')
+
+
+# Lowercase and tokenize a text in a single pass of the regular expression engine
+@instrument
+def tokenize_fast(text: str, vocabulary=None) -> list:
+    """ Lowercases and tokenizes a string text, returning its runs of word characters
+    as tokens. The text is scanned once, instead of removing punctuation into a copy
+    and splitting it as tokenize() does, and lowercase_corpus() is not needed
+    beforehand. Unlike tokenize(), punctuation within a word splits it rather than
+    being dropped, so that "don't" gives 'don' and 't' instead of 'dont'.
+    If a vocabulary (see zeta_project.encoding.Vocabulary) is specified, an int32
+    array of token IDs is returned instead of the token strings."""
+    tokens = WORD_PATTERN.findall(text.lower())
+    if vocabulary is None:
+        return tokens
+    return vocabulary.encode(tokens)
+
+
+# Resolve the number of worker processes, where '-1' stands for all the CPU cores
+@instrument
+def worker_count(n_process: int) -> int:
+    """ Returns the number of worker processes to start for the specified 'n_process'
+    value, i.e. the number of CPU cores for '-1' and the value itself otherwise."""
+    return os.cpu_count() if n_process == -1 else n_process
+
+
+# Start the pool of worker processes shared by all the parallel stages
+@instrument
+def process_pool(n_process: int) -> ProcessPoolExecutor:
+    """ Returns a ProcessPoolExecutor with the number of workers given by worker_count()."""
+    return ProcessPoolExecutor(max_workers=worker_count(n_process))
+
+
+# Apply a function to each text, within a pool of worker processes if required
+@instrument
+def map_texts(function, texts: list, n_process: int = 1) -> list:
+    """ Returns the list of the results of the function applied to each text. If
+    'n_process' is greater than 1 the texts are distributed over that number of
+    worker processes ('-1' uses all the CPU cores). The function must be picklable,
+    i.e. defined at module level."""
+    if n_process == 1 or len(texts) < 2:
+        return [function(text) for text in texts]
+    with process_pool(n_process) as executor:
+        chunksize = max(1, len(texts) // (worker_count(n_process) * 4))
+        return list(executor.map(function, texts, chunksize=chunksize))
+
+
 # Tokenize lowercase corpus
-def tokenize_corpus(texts_col: list) -> list:
+@instrument
+def tokenize_corpus(texts_col: list, cache_dir: str | None = None, fast: bool = False,
+                    vocabulary=None, n_process: int = 1) -> list:
     """ Tokenizes the string texts within a list, returning a list
-    of token sub-lists. Punctuation is also removed."""
-    return [tokenize(file) for file in texts_col]
+    of token sub-lists. Punctuation is also removed. If a cache directory is
+    specified, the tokens of each text are read from the cache and only the
+    texts missing from it are tokenized and stored.
+    With 'fast' the texts are tokenized by tokenize_fast(), which also lowercases
+    them and splits words at inner punctuation rather than joining their parts, so
+    that lowercase_corpus() is not needed beforehand. If a vocabulary is
+    specified, each text is returned as an int32 array of token IDs. The texts are
+    tokenized by 'n_process' worker processes ('-1' uses all the CPU cores)."""
+    texts = list(texts_col)
+    tokenizer = tokenize_fast if fast else tokenize
+    if cache_dir is None:
+        result = map_texts(tokenizer, texts, n_process)
+    else:
+        keys = [cache_key(file, tokenizer.__name__, TOKENIZER_VERSION) for file in texts]
+        result = [load_annotation(cache_dir, key) for key in keys]
+        missing = [i for i, layers in enumerate(result) if layers is None]
+        for i, tokens in zip(missing, map_texts(tokenizer, [texts[i] for i in missing], n_process)):
+            result[i] = {'tokens': tokens}
+            store_annotation(cache_dir, keys[i], result[i])
+        result = [layers['tokens'] for layers in result]
+    if vocabulary is not None:
+        return [vocabulary.encode(tokens) for tokens in result]
+    return result
+
+
+# Load each SpaCy model only once per process and reuse it for all the following calls
+@lru_cache(maxsize=None)
+@instrument
+def load_model(model_name: str = "en_core_web_sm") -> spacy.Language:
+    """ Loads and returns the specified SpaCy model. The loaded models are cached,
+    so that calling the function again with the same model name returns the very
+    same object without reading the model from disk again."""
+    return spacy.load(model_name)
 
 
 # Extract lemmata, Part-Of-Speech and Named-Entity-Recognition tags
 # from the string texts using the Spacy library
-def lemmata_pos_ner_tag(texts_col: pd.Series) -> list:
+@instrument
+def lemmata_pos_ner_tag(texts_col: pd.Series, model_name: str = "en_core_web_sm", n_process: int = 1,
+                        batch_size: int = 20, disable: tuple = (), cache_dir: str | None = None) -> list:
     """ Tokenizes the string texts within a pandas series and returns lemmata,
     Part-Of-Speech (POS) and Named-Entity-Recognition (NER) tags for each token within
     separate lists. The functionality is based on the SpaCy library, which
-    has to be imported before, and relies on the specific model 'en_core_web_sm'."""
-    nlp = spacy.load("en_core_web_sm")
-    lemma = []
-    pos = []
-    ner = []
-    for doc in nlp.pipe(texts_col, batch_size=20):
-        lemma.append([token.lemma_ for token in doc])
-        pos.append([token2.pos_ for token2 in doc])
-        ner.append([token3.label_ for token3 in doc.ents])
+    has to be imported before, and relies on the specific model 'en_core_web_sm'.
+    The texts are annotated by 'n_process' processes ('-1' uses all the CPU cores) in
+    batches of 'batch_size' texts. The pipeline components listed in 'disable' are
+    skipped, e.g. ('parser', 'ner') when only lemmata and POS tags are needed:
+    the NER lists are empty if the 'ner' component is disabled.
+    If a cache directory is specified, the annotations are read from the cache and
+    only the texts missing from it are processed by SpaCy and then stored. Cache
+    entries depend on the text content, the model name and version and the
+    disabled components."""
+    texts = list(texts_col)
+    annotations = [None] * len(texts)
+    keys = [None] * len(texts)
+    if cache_dir is not None:
+        model_version = spacy.util.get_package_version(model_name) or load_model(model_name).meta['version']
+        model_id = '|'.join([model_name, *sorted(disable)])
+        for i, text in enumerate(texts):
+            keys[i] = cache_key(text, model_id, model_version)
+            annotations[i] = load_annotation(cache_dir, keys[i])
+    missing = [i for i, layers in enumerate(annotations) if layers is None]
+    if missing:
+        nlp = load_model(model_name)
+        docs = nlp.pipe((texts[i] for i in missing), batch_size=batch_size, n_process=n_process,
+                        disable=list(disable))
+        for i, doc in zip(missing, docs):
+            annotations[i] = {'tokens': [token.text for token in doc],
+                              'lemma': [token.lemma_ for token in doc],
+                              'pos': [token2.pos_ for token2 in doc],
+                              'ner': [token3.label_ for token3 in doc.ents]}
+            if cache_dir is not None:
+                store_annotation(cache_dir, keys[i], annotations[i])
+    lemma = [layers['lemma'] for layers in annotations]
+    pos = [layers['pos'] for layers in annotations]
+    ner = [layers['ner'] for layers in annotations]
     return lemma, pos, ner
 
 
 # Eventually remove stopwords
+@instrument
 def remove_stopwords(stopwords_list: list, tokenized_text: list) -> list:
     """ Removes stopwords from a list of string tokens, returning
     a list of the filtered tokens. The stopwords themselves are
@@ -96,12 +297,14 @@ def remove_stopwords(stopwords_list: list, tokenized_text: list) -> list:
     return [token for token in tokenized_text if token not in stopwords_list]
 
 
+@instrument
 def remove_stopwords_corpus(stopwords_list: list, tokens_col: list) -> list:
     """ Removes stopwords from each string tokens list within a dataframe.
     The stopwords themselves are contained as string tokens within a list"""
     return [remove_stopwords(stopwords_list, tokenized_text) for tokenized_text in tokens_col]
 
 
+@instrument
 def replace_pattern_in_column(column: pd.Series, old_pattern: str, new_pattern: str) -> pd.Series:
     """ Replaces each matching string pattern from dataframe column values with a new
      pattern, which can be also an empty string. Returns the updated dataframe column"""
@@ -109,6 +312,7 @@ def replace_pattern_in_column(column: pd.Series, old_pattern: str, new_pattern:
 
 
 # Split the dataframe into 2 partitions based on a chosen value from a selected column
+@instrument
 def define_partitions(dataframe: pd.DataFrame, col_name: str, col_value: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     """ Splits a dataframe into two partitions, one referred to as the 'target partition' and the other
      as the 'reference partition'. The split is based on the specified dataframe column and a column value,
@@ -121,10 +325,52 @@ def define_partitions(dataframe: pd.DataFrame, col_name: str, col_value: str) ->
     return target_partition, reference_partition
 
 
+# Strip the file extension from the file names, so that they match the metadata 'idno' values
+@instrument
+def document_ids(file_names: Iterable[str]) -> list[str]:
+    """ Returns the file names without their extension (e.g. '.txt'), as the texts
+    are identified within the metadata table."""
+    return [os.path.splitext(file_name)[0] for file_name in file_names]
+
+
+# Read only the two metadata columns needed to partition the corpus into a dictionary
+@instrument
+def metadata_lookup(metadata_path: str, col_name: str) -> dict:
+    """ Returns a dictionary binding each 'idno' of the metadata TSV file to its value of
+    the specified column. If an 'idno' is repeated, its first row is used."""
+    meta = pd.read_csv(metadata_path, sep='\t', encoding='UTF-8', dtype=str, usecols=['idno', col_name])
+    lookup = {}
+    for idno, value in zip(meta['idno'], meta[col_name]):
+        lookup.setdefault(idno, value)
+    return lookup
+
+
+# Assign each text to a partition through a light label array, instead of merging and
+# splitting the whole dataframe with all its text, token and segment columns
+@instrument
+def partition_labels(idnos: Iterable[str], lookup: dict, col_value: str) -> np.ndarray:
+    """ Returns an int8 array holding, for each text 'idno', 1 if its metadata value (see
+    metadata_lookup()) equals the specified value, i.e. the text belongs to the target
+    partition, and 0 otherwise, also for texts missing from the metadata, as
+    define_partitions() does after a left merge."""
+    return np.fromiter((lookup.get(idno) == col_value for idno in idnos), dtype=np.int8)
+
+
+# Get the positions of the texts of each partition from the partition labels
+@instrument
+def partition_positions(labels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ Returns the positions of the texts of the target and of the reference partition,
+    so that the columns of the corpus can be indexed without being copied."""
+    return np.flatnonzero(labels == 1), np.flatnonzero(labels != 1)
+
+
 # Set a function to build the text segments (ideally 2000-5000 tokens)
+@instrument
 def build_segments(tokens: list, segment_len: int) -> list:
     """ Builds a series of token sub lists or segments based on the given segment length.
     The segment length corresponds to the number of tokens, each segment is made of.
+    If the tokens are a numpy array, e.g. a text of an EncodedCorpus, the segments are
+    views on that array and no token is copied.
     """
     # The index at which the tokens should be split is defined through the slice syntax.
     # The value '0' corresponds to the starting point, the total number of tokens – len(tokens) –
@@ -137,6 +383,7 @@ def build_segments(tokens: list, segment_len: int) -> list:
 
 
 # Build segments for each text of the corpus
+@instrument
 def build_segments_corpus(tokens_lists: list, segment_len: int) -> list:
     """ Builds a list of token segments from each tokens list, in which
     the corpus texts are split into. The argument 'segment_len' specifies
@@ -148,6 +395,7 @@ def build_segments_corpus(tokens_lists: list, segment_len: int) -> list:
 
 
 # Count total number of segments for each text
+@instrument
 def segments_count(segments_col: pd.Series) -> pd.Series:
     """ Returns a series of integers from a series of string
     tokens segments. The integers correspond to the total number
@@ -157,19 +405,61 @@ def segments_count(segments_col: pd.Series) -> pd.Series:
 
 # Consider now these subsets of tokens or segments as the unit to check if the specified feature
 # occurs within the texts. If the chosen feature occurs at least once, this is what matters
+@instrument
 def feature_occurs(segments_list: list, feature: str) -> list:
     """ Returns a list of those segments containing the specified feature """
     result = [segment for segment in segments_list if feature in segment]
     return result
 
 
+@instrument
 def feature_occurs_corpus(segments_column: list, feature: str) -> list:
     """ Returns a list, for each dataframe sample, of only those segments
     containing the specified feature """
     return [feature_occurs(segments, feature) for segments in segments_column]
 
 
+# Index the segments once, so that looking up a feature only touches the segments
+# actually containing it, instead of scanning every segment of the corpus
+@instrument
+def build_segments_index(segments_column: list) -> tuple[dict, list[int]]:
+    """ Returns an inverted index mapping each feature to the sorted list of IDs of the
+    segments containing it, together with the segment ID offsets of each text. Segment IDs
+    are assigned consecutively, so the segments of the i-th text have the IDs from
+    offsets[i] up to offsets[i + 1] (excluded)."""
+    index = {}
+    offsets = [0]
+    segment_id = 0
+    for segments in segments_column:
+        for segment in segments:
+            for feature in set(segment):
+                index.setdefault(feature, []).append(segment_id)
+            segment_id += 1
+        offsets.append(segment_id)
+    return index, offsets
+
+
+@instrument
+def feature_occurs_index(segments_index: dict, offsets: list[int], feature: str) -> list[list[int]]:
+    """ Returns a list, for each text, of the IDs of those segments containing the
+    specified feature. It is the counterpart of feature_occurs_corpus() for an index
+    defined by build_segments_index()."""
+    postings = segments_index.get(feature, [])
+    return [postings[bisect_left(postings, start):bisect_left(postings, stop)]
+            for start, stop in zip(offsets, offsets[1:])]
+
+
+@instrument
+def count_segments_with_feature_index(segments_index: dict, offsets: list[int], feature: str) -> list[int]:
+    """ Returns a list with the total number of segments containing the specified feature
+    for each text, reading only the index postings of that feature."""
+    postings = segments_index.get(feature, [])
+    text_ids = np.searchsorted(offsets, postings, side='right') - 1
+    return np.bincount(text_ids, minlength=len(offsets) - 1).tolist()
+
+
 # Count the total number of segments containing the chosen feature for each document
+@instrument
 def count_segments_with_feature(segments_column: list) -> list[int]:
     """ Returns a list with the total number of segments containing the specified
     feature. The total number is referred to each text item """
@@ -177,6 +467,7 @@ def count_segments_with_feature(segments_column: list) -> list[int]:
 
 
 # Sum the number of segments containing the specified feature for the whole corpus partition
+@instrument
 def total_count(column_counts: pd.Series) -> int:
     """ Returns the sum of a series of integer values """
     if column_counts.dtype == float:
@@ -186,6 +477,7 @@ def total_count(column_counts: pd.Series) -> int:
 
 # Compute the ratio of the total number of segments containing the feature
 # over the total number of segments within a partition
+@instrument
 def ratio(segments_with_feature_count: int, segments_count: int) -> float:
     """ Returns the percentage of segments containing the specified feature
     over all segments of a partition"""
@@ -196,13 +488,381 @@ def ratio(segments_with_feature_count: int, segments_count: int) -> float:
 
 
 # Compute zeta
+@instrument
 def zeta(ratio_1: float, ratio_2: float) -> float:
     """ Returns the percentage of how consistently the specified feature
     is used within the target partition compared to the reference partition"""
     return ratio_1 - ratio_2
 
 
+# Collect all the features occurring within one or more segments columns, so that
+# each feature is bound to a fixed column index of the occurrence matrix
+@instrument
+def build_vocabulary(*segments_columns: list) -> dict:
+    """ Returns a dictionary mapping each distinct feature found within the specified
+    segments columns to an integer index. Indices follow the order of first occurrence."""
+    vocabulary = {}
+    for segments_column in segments_columns:
+        for segments in segments_column:
+            for segment in segments:
+                for feature in segment:
+                    if feature not in vocabulary:
+                        vocabulary[feature] = len(vocabulary)
+    return vocabulary
+
+
+# Build the sparse segments x vocabulary matrix for a corpus partition. Every segment
+# is scanned only once, instead of once for each feature
+@instrument
+def segment_feature_matrix(segments_column: list, vocabulary: dict, binary: bool = True) -> sparse.csr_matrix:
+    """ Returns a sparse binary matrix with one row for each segment within the segments column
+    and one column for each vocabulary feature. A cell is 1 if the feature occurs at least once
+    in the segment. Features missing from the vocabulary are ignored. If 'binary' is False
+    the cells hold the number of occurrences of the feature within the segment instead."""
+    indptr = [0]
+    indices = []
+    data = []
+    for segments in segments_column:
+        for segment in segments:
+            if binary:
+                indices.extend({vocabulary[feature] for feature in segment if feature in vocabulary})
+            else:
+                counts = Counter(vocabulary[feature] for feature in segment if feature in vocabulary)
+                indices.extend(counts.keys())
+                data.extend(counts.values())
+            indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int8) if binary else np.asarray(data, dtype=np.int32)
+    return sparse.csr_matrix((data, np.asarray(indices, dtype=np.int64), indptr),
+                             shape=(len(indptr) - 1, len(vocabulary)))
+
+
+# Count for every vocabulary feature the segments of a partition containing it
+@instrument
+def feature_segment_counts(matrix: sparse.csr_matrix) -> np.ndarray:
+    """ Returns an array with the number of segments (matrix rows) containing each
+    feature (matrix column) of a binary occurrence matrix."""
+    return np.bincount(matrix.indices, minlength=matrix.shape[1])
+
+
+# Gather the per-feature counts of both partitions into a zeta summary dataframe
+@instrument
+def zeta_table(features: list, target_counts: np.ndarray, reference_counts: np.ndarray,
+               target_segments: int, reference_segments: int) -> pd.DataFrame:
+    """ Returns a dataframe with the number of segments containing each feature, the target
+    and reference partition ratios and the zeta value for each of the specified features,
+    given the number of segments containing them and the total number of segments of
+    each partition. The dataframe is sorted by descending zeta values."""
+    if target_segments == 0 or reference_segments == 0:
+        raise ZeroDivisionError("Division by zero is not allowed")
+    target_ratios = np.asarray(target_counts) / target_segments
+    reference_ratios = np.asarray(reference_counts) / reference_segments
+    result = pd.DataFrame({'Feature': features,
+                           'Target Segments with Feature': target_counts,
+                           'Reference Segments with Feature': reference_counts,
+                           'Target Partition Ratio': target_ratios,
+                           'Reference Partition Ratio': reference_ratios,
+                           'Zeta Value': zeta(target_ratios, reference_ratios)})
+    return sort_descending(result, 'Zeta Value').reset_index(drop=True)
+
+
+# Compute zeta from counters of the segments containing each feature, as aggregated by the streaming,
+# incremental and chunked pipelines
+@instrument
+def zeta_from_counters(target_counts: Counter, reference_counts: Counter, target_segments: int,
+                       reference_segments: int) -> pd.DataFrame:
+    """ Returns the zeta summary dataframe, as zeta_table() does, for all the features of
+    the target and reference counters of the segments containing each feature."""
+    features = list(target_counts.keys() | reference_counts.keys())
+    return zeta_table(features, np.array([target_counts[feature] for feature in features], dtype=np.int64),
+                      np.array([reference_counts[feature] for feature in features], dtype=np.int64),
+                      target_segments, reference_segments)
+
+
+# Compute zeta for a batch of features in a single pass over the segments
+@instrument
+def compute_zeta(target: list, reference: list, features: Iterable[str] | None = None) -> pd.DataFrame:
+    """ Returns a dataframe with the number of segments containing each of the specified
+    features, the target and reference partition ratios and the zeta value, sorted by
+    descending zeta values. All the features of the target and reference segments
+    columns are evaluated if no features are specified. Features occurring in neither
+    partition are reported with zero ratios."""
+    if features is None:
+        vocabulary = build_vocabulary(target, reference)
+    else:
+        vocabulary = {}
+        for feature in features:
+            vocabulary.setdefault(feature, len(vocabulary))
+    target_matrix = segment_feature_matrix(target, vocabulary)
+    reference_matrix = segment_feature_matrix(reference, vocabulary)
+    return zeta_table(list(vocabulary), feature_segment_counts(target_matrix),
+                      feature_segment_counts(reference_matrix), target_matrix.shape[0], reference_matrix.shape[0])
+
+
+# Compute zeta for the whole vocabulary at once, rather than feature by feature
+@instrument
+def zeta_all_features(target: list, reference: list) -> pd.DataFrame:
+    """ Returns a dataframe with the number of segments containing each feature, the target
+    and reference partition ratios and the zeta value for all the features occurring
+    within the target and reference segments columns. The dataframe is sorted by
+    descending zeta values."""
+    return compute_zeta(target, reference)
+
+
+# Count the segments containing each vocabulary feature text by text
+@instrument
+def document_feature_matrix(segments_column: list, vocabulary: dict) -> sparse.csr_matrix:
+    """ Returns a sparse matrix with one row for each text within the segments column and
+    one column for each vocabulary feature. Each cell holds the number of segments of the
+    text containing the feature, i.e. the value count_segments_with_feature() returns."""
+    segment_matrix = segment_feature_matrix(segments_column, vocabulary)
+    counts = [len(segments) for segments in segments_column]
+    texts = sparse.csr_matrix((np.ones(segment_matrix.shape[0], dtype=np.int32),
+                               (np.repeat(np.arange(len(counts)), counts), np.arange(segment_matrix.shape[0]))),
+                              shape=(len(counts), segment_matrix.shape[0]))
+    return (texts @ segment_matrix.astype(np.int32)).tocsr()
+
+
+# Keep only the per-text statistics of the segments, rather than the segments themselves
+class SegmentStatistics:
+    """ Holds, for each text, its number of segments ('Segments Count') and one row of a
+    sparse texts x vocabulary matrix with the number of its segments containing each
+    feature ('Number of Segments with Feature'), as document_feature_matrix() returns.
+    Partitions are taken as row subsets, without any list of segments. The vocabulary
+    can be shared with statistics built later, which may add features to it: only the
+    feature IDs within the columns of the matrix are looked up."""
+
+    def __init__(self, segments_count: np.ndarray, counts: sparse.csr_matrix, vocabulary: dict):
+        self.segments_count = np.asarray(segments_count, dtype=np.int64)
+        self.counts = counts.tocsr()
+        self.vocabulary = vocabulary
+        self.columns = None
+
+    @classmethod
+    def from_segments(cls, segments_column: list, vocabulary: dict | None = None) -> 'SegmentStatistics':
+        """ Returns the statistics of a segments column, as build_segments_corpus() returns."""
+        if vocabulary is None:
+            vocabulary = build_vocabulary(segments_column)
+        return cls([len(segments) for segments in segments_column],
+                   document_feature_matrix(segments_column, vocabulary), vocabulary)
+
+    @classmethod
+    def from_tokens(cls, tokens_lists: Iterable[list], segment_len: int,
+                    vocabulary: dict | None = None) -> 'SegmentStatistics':
+        """ Returns the statistics of the segments of the specified length of each tokens
+        list. The segments of a text are discarded as soon as they have been counted.
+        The features missing from the vocabulary are added to it."""
+        if vocabulary is None:
+            vocabulary = {}
+        totals, indptr, indices, data = [], [0], [], []
+        for tokens in tokens_lists:
+            segments_total, feature_counts = summarize_segments(build_segments(tokens, segment_len))
+            totals.append(segments_total)
+            indices.extend(vocabulary.setdefault(feature, len(vocabulary)) for feature in feature_counts)
+            data.extend(feature_counts.values())
+            indptr.append(len(indices))
+        counts = sparse.csr_matrix((np.array(data, dtype=np.int32), np.array(indices, dtype=np.int64),
+                                    np.array(indptr, dtype=np.int64)), shape=(len(totals), len(vocabulary)))
+        counts.sort_indices()
+        return cls(totals, counts, vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.segments_count)
+
+    def feature_counts(self, feature: str) -> np.ndarray:
+        """ Returns the number of segments of each text containing the feature, zero
+        for all the texts if the feature is unknown."""
+        index = self.vocabulary.get(feature)
+        if index is None or index >= self.counts.shape[1]:
+            return np.zeros(len(self), dtype=np.int64)
+        if self.columns is None:
+            self.columns = self.counts.tocsc()
+        return self.columns[:, index].toarray().ravel().astype(np.int64)
+
+    def take(self, rows: np.ndarray) -> 'SegmentStatistics':
+        """ Returns the statistics of the texts at the specified positions, e.g. those of a
+        partition (see partition_positions())."""
+        rows = np.asarray(rows, dtype=np.int64)
+        return SegmentStatistics(self.segments_count[rows], self.counts[rows], self.vocabulary)
+
+    def to_dataframe(self, feature: str | None = None) -> pd.DataFrame:
+        """ Returns a dataframe with the 'Segments Count' column and, if a feature is
+        specified, the 'Number of Segments with Feature' column."""
+        df = pd.DataFrame({'Segments Count': self.segments_count})
+        if feature is not None:
+            df['Number of Segments with Feature'] = self.feature_counts(feature)
+        return df
+
+    def zeta(self, target_rows: np.ndarray, reference_rows: np.ndarray) -> pd.DataFrame:
+        """ Returns the zeta summary dataframe, as zeta_all_features() does, for the texts
+        at the target and reference positions."""
+        target, reference = self.take(target_rows), self.take(reference_rows)
+        features = [None] * self.counts.shape[1]
+        for feature, index in self.vocabulary.items():
+            if index < len(features):
+                features[index] = feature
+        return zeta_table(features, np.asarray(target.counts.sum(axis=0)).ravel(),
+                          np.asarray(reference.counts.sum(axis=0)).ravel(),
+                          int(target.segments_count.sum()), int(reference.segments_count.sum()))
+
+
+# Compare each group of texts sharing a metadata value with all the other texts, e.g. each
+# author with all the other authors, from a single aggregation of the per-text counts
+@instrument
+def zeta_one_vs_rest(segments_column: list, labels: list) -> pd.DataFrame:
+    """ Returns, for each distinct value of 'labels' (e.g. a metadata column aligned with
+    the segments column), the zeta summary of the texts with that value as target
+    partition and all the other texts as reference partition, for all the features.
+    The summaries are stacked into one dataframe with an additional 'Group' column.
+    Texts with a missing label are ignored, as are the groups without any segment and,
+    if all the segments belong to a single group, that group, since zeta is undefined
+    for an empty partition. No dataframe is copied: the groups are only index masks
+    over the per-text counts."""
+    codes, groups = pd.factorize(pd.Series(labels))
+    vocabulary = build_vocabulary(segments_column)
+    counts = document_feature_matrix(segments_column, vocabulary)
+    segments_total = np.array([len(segments) for segments in segments_column], dtype=np.int64)
+    labelled = np.flatnonzero(codes >= 0)
+    indicator = sparse.csr_matrix((np.ones(len(labelled), dtype=np.int32), (codes[labelled], labelled)),
+                                  shape=(len(groups), len(codes)))
+    group_counts = (indicator @ counts).toarray()
+    group_segments = np.bincount(codes[labelled], weights=segments_total[labelled], minlength=len(groups))
+    all_counts = group_counts.sum(axis=0)
+    features = list(vocabulary)
+    summaries = []
+    for i, group in enumerate(groups):
+        target_segments = int(group_segments[i])
+        reference_segments = int(group_segments.sum()) - target_segments
+        if target_segments == 0 or reference_segments == 0:
+            continue
+        summary = zeta_table(features, group_counts[i], all_counts - group_counts[i],
+                             target_segments, reference_segments)
+        summary.insert(0, 'Group', group)
+        summaries.append(summary)
+    if not summaries:
+        return pd.DataFrame(columns=['Group', 'Feature', 'Target Segments with Feature',
+                                     'Reference Segments with Feature', 'Target Partition Ratio',
+                                     'Reference Partition Ratio', 'Zeta Value'])
+    return pd.concat(summaries, ignore_index=True)
+
+
+# Keep the k best features while visiting the candidates by decreasing document frequency,
+# and stop as soon as the bound of the remaining candidates cannot enter the heap anymore
+@instrument
+def bounded_top_k(candidates: dict, other: dict, k: int, sign: int, size: int, other_size: int) -> list:
+    """ Returns the (zeta value, feature) pairs of the k features of 'candidates' with the
+    highest zeta values (sign 1) or the lowest (sign -1), where zeta is the difference
+    between the ratio of the feature in its own partition (its postings list within
+    'candidates' over 'size' segments) and in the other partition ('other' over
+    'other_size' segments), signed accordingly. Since the signed zeta value of a feature
+    is at most its own ratio, the features with fewer segments than the k-th best value
+    allows are never scored. The features only found in the other partition have a count
+    of 0 and a negative zeta value, so they are only scored while the list is not full
+    or its k-th value is negative."""
+    if k <= 0:
+        return []
+    levels = {}
+    for feature, postings in candidates.items():
+        levels.setdefault(len(postings), []).append(feature)
+    heap = []
+    for count in sorted(levels, reverse=True):
+        if len(heap) == k and count / size <= heap[0][0]:
+            break
+        for feature in levels[count]:
+            value = count / size - len(other.get(feature, ())) / other_size
+            if len(heap) < k:
+                heapq.heappush(heap, (value, feature))
+            elif value > heap[0][0]:
+                heapq.heapreplace(heap, (value, feature))
+    if len(heap) < k or heap[0][0] < 0:
+        # The best missing features are the rarest in the other partition
+        missing = [(-len(postings) / other_size, feature) for feature, postings in other.items()
+                   if feature not in candidates]
+        heap = heapq.nlargest(k, heap + missing)
+    return [(sign * value, feature) for value, feature in heap]
+
+
+# Extract only the most distinctive features of both partitions, without scoring and
+# sorting the long tail of rare features
+@instrument
+def top_k_zeta(target_index: dict, target_offsets: list[int], reference_index: dict,
+               reference_offsets: list[int], k: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """ Returns two zeta summary dataframes, with the k features of the target partition
+    having the highest zeta values (sorted by descending zeta) and the k features of the
+    reference partition having the lowest ones (sorted by ascending zeta), given the
+    indexes of the target and reference segments defined by build_segments_index().
+    Either list is filled with the features of the other partition if its own one has
+    fewer than k features. A feature can only reach a zeta value as high as its
+    target ratio, or as low as minus its reference ratio, so candidates are visited by
+    decreasing number of segments and the rare ones are pruned once the k-th value is
+    out of their reach."""
+    target_segments, reference_segments = target_offsets[-1], reference_offsets[-1]
+    if target_segments == 0 or reference_segments == 0:
+        raise ZeroDivisionError("Division by zero is not allowed")
+    top = bounded_top_k(target_index, reference_index, k, 1, target_segments, reference_segments)
+    bottom = bounded_top_k(reference_index, target_index, k, -1, reference_segments, target_segments)
+    tables = []
+    for selected, ascending in ((top, False), (bottom, True)):
+        features = [feature for _, feature in selected]
+        table = zeta_table(features, np.array([len(target_index.get(f, ())) for f in features], dtype=np.int64),
+                           np.array([len(reference_index.get(f, ())) for f in features], dtype=np.int64),
+                           target_segments, reference_segments)
+        tables.append(table.iloc[::-1].reset_index(drop=True) if ascending else table)
+    return tables[0], tables[1]
+
+
+# Read the corpus texts one at a time, instead of keeping the whole collection in memory
+@instrument
+def stream_texts(specified_path: str) -> Iterator[tuple[str, str]]:
+    """ Yields a (file name, text content) pair for each text file within the specified
+    directory path. Each file is read only when the pair is requested and the
+    working directory is not changed."""
+    for file in sorted(os.listdir(specified_path)):
+        if file.endswith(".txt"):
+            yield file, read_text(os.path.join(specified_path, file))
+
+
+# Reduce the segments of a single text to the number of segments containing each feature
+@instrument
+def summarize_segments(segments: list) -> tuple[int, Counter]:
+    """ Returns the total number of segments and a counter with the number of
+    segments containing each feature."""
+    feature_counts = Counter()
+    for segment in segments:
+        feature_counts.update(set(segment))
+    return len(segments), feature_counts
+
+
+# Chain lowercasing, tokenization, segmentation and counting text by text, so that the
+# memory in use is bounded by the largest single text rather than by the whole corpus
+@instrument
+def stream_segment_summaries(texts: Iterable[tuple[str, str]], segment_len: int) -> Iterator[tuple[str, int, Counter]]:
+    """ Yields, for each (file name, text content) pair, the file name, the total
+    number of segments and a counter with the number of segments containing each
+    feature. Texts are lowercased, tokenized and split into segments of the
+    specified length one at a time."""
+    for idno, text in texts:
+        segments = build_segments(tokenize(lowercase(text)), segment_len)
+        yield (idno, *summarize_segments(segments))
+
+
+# Aggregate the streamed summaries into partition totals and compute zeta from them
+@instrument
+def zeta_from_summaries(summaries: Iterable[tuple[str, int, Counter]], target_idnos: set) -> pd.DataFrame:
+    """ Returns the zeta summary dataframe, as zeta_all_features() does, from the
+    summaries yielded by stream_segment_summaries(). The texts whose idno, i.e. the
+    file name without extension (see document_ids()), is within 'target_idnos' form
+    the target partition, all the others the reference partition."""
+    totals = {True: 0, False: 0}
+    counts = {True: Counter(), False: Counter()}
+    for file_name, segments_total, feature_counts in summaries:
+        is_target = document_ids([file_name])[0] in target_idnos
+        totals[is_target] += segments_total
+        counts[is_target].update(feature_counts)
+    return zeta_from_counters(counts[True], counts[False], totals[True], totals[False])
+
+
 # Insert a list of values into a dataframe
+@instrument
 def fill_dataframe(dataframe: pd.DataFrame, values: list) -> pd.DataFrame:
     """ Inserts the specified list of values into the existing dataframe. The number of values
     must correspond to the number of labels in the dataframe"""
@@ -214,29 +874,108 @@ def fill_dataframe(dataframe: pd.DataFrame, values: list) -> pd.DataFrame:
 # the highest number of segments containing the specified feature figures at the top,
 # and the text with the lowest number of segments containing the feature is
 # at the bottom
+@instrument
 def sort_descending(dataframe: pd.DataFrame, column: str) -> pd.DataFrame:
     """ Returns a dataframe sorted by the values from the specified column, in descending order """
     return dataframe.sort_values(by=column, ascending=False)
 
 
+# Collect the zeta results column by column, so that adding a result never copies the
+# previous ones, as inserting dataframe rows with fill_dataframe() does
+class ZetaResults:
+    """ Accumulates the feature, the target and reference partition ratios and the zeta
+    value of each evaluated feature within preallocated arrays, which double their
+    capacity when full. The dataframe is built only once by to_dataframe()."""
+
+    columns = ['Feature', 'Target Partition Ratio', 'Reference Partition Ratio', 'Zeta Value']
+
+    def __init__(self, capacity: int = 1024):
+        self.features = []
+        self.values = np.empty((max(capacity, 1), 3), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def reserve(self, size: int) -> None:
+        """ Grows the preallocated arrays, so that they can hold at least 'size' results."""
+        if size > len(self.values):
+            values = np.empty((max(size, 2 * len(self.values)), 3), dtype=np.float64)
+            values[:len(self)] = self.values[:len(self)]
+            self.values = values
+
+    def append(self, feature: str, target_ratio: float, reference_ratio: float, zeta_value: float) -> None:
+        """ Adds the result of a single feature."""
+        self.reserve(len(self) + 1)
+        self.values[len(self)] = (target_ratio, reference_ratio, zeta_value)
+        self.features.append(feature)
+
+    def extend(self, features: list, target_ratios, reference_ratios, zeta_values) -> None:
+        """ Adds the results of several features at once, given as equally long sequences."""
+        features = list(features)
+        self.reserve(len(self) + len(features))
+        self.values[len(self):len(self) + len(features)] = np.column_stack(
+            (target_ratios, reference_ratios, zeta_values))
+        self.features.extend(features)
+
+    def to_dataframe(self, rows: np.ndarray | None = None) -> pd.DataFrame:
+        """ Returns a dataframe with the accumulated results, or only with the specified rows."""
+        values = self.values[:len(self)]
+        features = np.array(self.features, dtype=object)
+        if rows is not None:
+            values = values[rows]
+            features = features[rows]
+        result = pd.DataFrame(values, columns=self.columns[1:])
+        result.insert(0, self.columns[0], features)
+        return result
+
+    def top_k(self, k: int, column: str = 'Zeta Value', largest: bool = True) -> pd.DataFrame:
+        """ Returns a dataframe with the k results having the largest (or the smallest)
+        values within the specified numeric column, sorted accordingly."""
+        if column not in self.columns[1:]:
+            raise ValueError(f"Cannot rank the results by column: {column}")
+        values = self.values[:len(self), self.columns.index(column) - 1]
+        return self.to_dataframe(top_k_indices(values, k, largest))
+
+
+# Select the k largest or smallest values without sorting all of them
+@instrument
+def top_k_indices(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """ Returns the positions of the k largest (or smallest) values, sorted by value. The
+    values are partitioned with numpy.argpartition() and only the k selected ones are
+    sorted, which takes linear rather than n log n time."""
+    values = np.asarray(values)
+    keys = -values if largest else values
+    if k >= len(values):
+        return np.argsort(keys, kind='stable')
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    selected = np.argpartition(keys, k - 1)[:k]
+    return selected[np.argsort(keys[selected], kind='stable')]
+
+
+@instrument
+def top_k(dataframe: pd.DataFrame, column: str, k: int, largest: bool = True) -> pd.DataFrame:
+    """ Returns the k dataframe rows having the largest (or the smallest) values within
+    the specified column, sorted accordingly. It is the top-k counterpart of sort_descending()."""
+    return dataframe.iloc[top_k_indices(dataframe[column].to_numpy(), k, largest)]
+
+
 # Executing as standalone script
 if __name__ == '__main__':
-    # First create a dataframe to which append the results
-    # Module 'DataFrame' from pandas is required!
-    summary: DataFrame = pd.DataFrame(
-        columns=['Feature', 'Target Partition Ratio', 'Reference Partition Ratio', 'Zeta Value'])
+    # First create the accumulator to which append the results
+    results = ZetaResults()
 
     corpus_path = input("Enter the directory path to the text corpus: ")
-    dictionary = define_dictionary(corpus_path)
+    dictionary = load_corpus(corpus_path)
     df = create_df(dictionary)
     # Extra function to remove file extension suffix and make it match with the metadata table value
-    df['idno'] = replace_pattern_in_column(df['idno'], '.txt$', '')
+    df['idno'] = document_ids(df['idno'])
 
     # Preprocess all the corpus texts
     df['Lowercase Text'] = lowercase_corpus(df.Text)
     df['Tokenized Text'] = tokenize_corpus(df['Lowercase Text'])
     # Define lemmata, Part-of-Speech and Named-Entity-Recognition tags
-    lemmata_and_pos = lemmata_pos_ner_tag(df["Text"])
+    lemmata_and_pos = lemmata_pos_ner_tag(df["Text"], n_process=-1)
     df["Lemmata"] = lemmata_and_pos[0]
     df["POS"] = lemmata_and_pos[1]
     df["NER"] = lemmata_and_pos[2]
@@ -246,38 +985,40 @@ if __name__ == '__main__':
     # Set segments length
     segment_length = input("Specify the desired segment length (in tokens): ")
     # Choose alternatively df['Tokenized Text'], df["Lemmata"], df["POS"] or df['NER'] as first parameter of
-    # the "build_segments_corpus()" function, depending on the feature you are going to consider in the analysis
-    df['Segments'] = build_segments_corpus(df['Tokenized Text'], int(segment_length))
-    # df['Segments'] = build_segments_corpus(df['Text No Stopwords'], int(segment_length))
-    df['Segments Count'] = segments_count(df['Segments'])
+    # "SegmentStatistics.from_tokens()", depending on the feature you are going to consider in the analysis.
+    # Only the number of segments of each text and of those containing each feature are kept, not the segments
+    statistics = SegmentStatistics.from_tokens(df['Tokenized Text'], int(segment_length))
+    # statistics = SegmentStatistics.from_tokens(df['Text No Stopwords'], int(segment_length))
+    df['Segments Count'] = statistics.segments_count
     print(df)
 
-    # Get metadata and read it to a dataframe
+    # Get metadata path
     meta_path = input("Enter the directory path to the metadata: ")
-    meta = pd.read_csv(meta_path, sep='\t', encoding='UTF-8')
-
-    # Merge text corpus dataframe with metadata dataframe
-    merged = df.merge(meta, how='left', on='idno')
-    print(merged)
 
-    # Split merged dataframe into target and reference partition based on metadata values
+    # Label each text as target or reference partition based on metadata values, without merging
+    # the metadata into the corpus dataframe and copying its columns into the partitions
     meta_col, meta_value = [item for item in input("Specify the metadata column name and a corresponding value to "
                                                    "split the corpus into target and reference partition\n (use shift "
                                                    "key to separate): ").split()]
-    zp, vp = define_partitions(merged, meta_col, meta_value)
+    labels = partition_labels(df['idno'], metadata_lookup(meta_path, meta_col), meta_value)
+    target_rows, reference_rows = partition_positions(labels)
+    target_statistics, reference_statistics = statistics.take(target_rows), statistics.take(reference_rows)
 
     while True:
         # Specify a feature with respect to which calculate zeta
-        chosen_feature = input("Specify a feature: ")
+        chosen_feature = input("Specify a feature (or 'all' to rank the whole vocabulary): ")
+        if chosen_feature == "all":
+            all_features = statistics.zeta(target_rows, reference_rows)
+            results.extend(all_features['Feature'], all_features['Target Partition Ratio'],
+                           all_features['Reference Partition Ratio'], all_features['Zeta Value'])
+            break
 
-        # Process data within target partition
-        zp['Feature Occurrence'] = feature_occurs_corpus(zp['Segments'], chosen_feature)
-        zp['Number of Segments with Feature'] = count_segments_with_feature(zp['Feature Occurrence'])
+        # Read the segments counts of each partition straight from the statistics
+        zp = target_statistics.to_dataframe(chosen_feature)
+        zp.insert(0, 'idno', df['idno'].to_numpy()[target_rows])
+        vp = reference_statistics.to_dataframe(chosen_feature)
+        vp.insert(0, 'idno', df['idno'].to_numpy()[reference_rows])
         zp_sorted = sort_descending(zp, 'Number of Segments with Feature')
-
-        # Process data within reference partition
-        vp['Feature Occurrence'] = feature_occurs_corpus(vp['Segments'], chosen_feature)
-        vp['Number of Segments with Feature'] = count_segments_with_feature(vp['Feature Occurrence'])
         vp_sorted = sort_descending(vp, 'Number of Segments with Feature')
 
         # Target partition and reference partition dataframes output
@@ -303,14 +1044,14 @@ if __name__ == '__main__':
         # Calculate Zeta, with values range [-1,1]
         zeta_value = zeta(zp_ratio, vp_ratio)
         print(f'Zeta value with reference to the chosen feature "', chosen_feature, '" : ', zeta_value)
-        fill_dataframe(summary, [chosen_feature, zp_ratio, vp_ratio, zeta_value])
+        results.append(chosen_feature, zp_ratio, vp_ratio, zeta_value)
 
         new_feature = input("Any other feature? (y/n): ")
         if new_feature.lower() != "y":
             break
 
     # Sort the results dataframe by descending values of zeta
-    summary = sort_descending(summary, 'Zeta Value')
+    summary: DataFrame = sort_descending(results.to_dataframe(), 'Zeta Value')
     # Eventually save the definitive dataframe to a csv file in the current working directory
     # summary.to_csv('zeta-summary.csv')
     print(summary)